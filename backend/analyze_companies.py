@@ -7,43 +7,43 @@ Based on research and known information about which companies use which ATS.
 # Companies that are KNOWN to use different ATS platforms (not Greenhouse)
 COMPANIES_USING_OTHER_ATS = {
     # Companies that use Workday
-    "workday_companies": [
+    "workday_companies": frozenset({
         "Netflix", "Adobe", "Salesforce", "Oracle", "IBM", "Cisco", "Intel", 
         "Paypal", "eBay", "Zoom", "Slack", "Atlassian", "MongoDB", "Okta"
-    ],
+    }),
     
     # Companies that use Lever
-    "lever_companies": [
+    "lever_companies": frozenset({
         "GitHub", "Buffer", "AngelList", "Segment", "ClassPass", "Postmates",
         "Honey", "Revolut", "Circle", "Whoop"
-    ],
+    }),
     
     # Companies that use SmartRecruiters  
-    "smartrecruiters_companies": [
+    "smartrecruiters_companies": frozenset({
         "Canva", "Bosch", "Visa", "Hilton", "IKEA", "LinkedIn", "Salesforce"
-    ],
+    }),
     
     # Companies that use AshbyHQ
-    "ashby_companies": [
+    "ashby_companies": frozenset({
         "Snowflake", "Notion", "Linear", "Vercel", "Ramp", "Retool",
         "Anthropic", "OpenAI", "Scale AI", "Weights & Biases"
-    ],
+    }),
     
     # Companies that use BambooHR
-    "bamboohr_companies": [
+    "bamboohr_companies": frozenset({
         "Asana", "SoundCloud", "Foursquare", "Postmates"
-    ],
+    }),
     
     # Companies that use their own custom ATS
-    "custom_ats_companies": [
+    "custom_ats_companies": frozenset({
         "Google", "Apple", "Microsoft", "Amazon", "Meta", "Tesla", 
         "Shopify", "Spotify", "Uber", "Twitter/X"
-    ],
+    }),
     
     # Companies that use iCIMS
-    "icims_companies": [
+    "icims_companies": frozenset({
         "American Express", "Johnson & Johnson", "Home Depot", "Target"
-    ]
+    })
 }
 
 # Companies in our current list with known ATS issues
@@ -83,6 +83,9 @@ VERIFIED_WORKING_COMPANIES = [
     {"name": "Notion", "slug": "notion"},  # Actually might use AshbyHQ now
 ]
 
+# Slug -> name lookup for the verified list, built once
+_SLUG_TO_NAME = {company["slug"]: company["name"] for company in VERIFIED_WORKING_COMPANIES}
+
 # Additional companies that are known to use Greenhouse
 ADDITIONAL_GREENHOUSE_COMPANIES = [
     {"name": "Instacart", "slug": "instacart"},
@@ -137,11 +140,7 @@ def generate_cleaned_company_list():
     print("=" * 60)
     for slug, info in PROBLEMATIC_COMPANIES.items():
         # Find the company name
-        company_name = None
-        for company in VERIFIED_WORKING_COMPANIES:
-            if company["slug"] == slug:
-                company_name = company["name"]
-                break
+        company_name = _SLUG_TO_NAME.get(slug)
         
         if company_name:
             print(f'    # {{"name": "{company_name}", "slug": "{slug}"}},  # {info["reason"]}')
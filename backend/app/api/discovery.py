@@ -3,14 +3,22 @@ API endpoint to run comprehensive Greenhouse company testing.
 This allows running the discovery script remotely via Railway.
 """
 import asyncio
+import functools
 import time
+import uuid
+from itertools import islice
 from typing import Dict, List, Any
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from loguru import logger
+from cachetools import TTLCache
 import httpx
+import orjson
+
+from app.core.http_clients import get_greenhouse_client
+from app.services.greenhouse import VERIFIED_GREENHOUSE_SLUGS
 
 # Import the comprehensive company list from our test script
-COMPREHENSIVE_COMPANY_LIST = [
+COMPREHENSIVE_COMPANY_LIST = tuple(dict.fromkeys([
     # Current working companies
     "stripe", "airbnb", "robinhood", "peloton", "dropbox", "coinbase", 
     "reddit", "lyft", "doordashusa", "pinterest", "databricks", "figma", 
@@ -55,16 +63,46 @@ COMPREHENSIVE_COMPANY_LIST = [
     "doordash", "door-dash", "epic-games", "epic", "epicgames",
     "riotgames", "riot-games", "activision-blizzard", "blizzard-entertainment",
     "electronic-arts", "ea-games", "twenty-three-and-me", "23-and-me"
-]
+]))  # dict.fromkeys drops duplicate slugs while preserving order
+
+# Slugs already tracked in VERIFIED_GREENHOUSE_COMPANIES
+EXISTING_GREENHOUSE_SLUGS = VERIFIED_GREENHOUSE_SLUGS
+
+# Maximum number of in-flight Greenhouse requests during discovery
+DISCOVERY_CONCURRENCY = 20
+
+# Upper bound on slugs accepted by the batch test endpoint
+MAX_TEST_COMPANIES = 100
+
+# Greenhouse board presence changes on the order of days, so cache aggressively.
+# Full discovery responses (with the per-company results they were built from)
+# are keyed by `limit`; per-slug results are shared
+# between discovery and the single-company endpoint.
+_discovery_cache: TTLCache = TTLCache(maxsize=8, ttl=3600)
+_company_result_cache: TTLCache = TTLCache(maxsize=1024, ttl=1800)
+_company_cache_stats = {"hits": 0, "misses": 0}
+
+# Background discovery jobs by id; finished jobs expire after an hour
+_discovery_jobs: TTLCache = TTLCache(maxsize=32, ttl=3600)
 
 router = APIRouter()
 
-async def test_single_company(slug: str, session: httpx.AsyncClient) -> Dict[str, Any]:
-    """Test a single company's Greenhouse endpoint."""
-    url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
+@functools.lru_cache(maxsize=1024)
+def _slug_to_name(slug: str) -> str:
+    """Turn a board slug into a display name (e.g. 'epic-games' -> 'Epic Games')."""
+    return slug.replace("-", " ").title()
+
+async def test_single_company(slug: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Test a single company's Greenhouse endpoint using the shared client."""
+    cached = _company_result_cache.get(slug)
+    if cached is not None:
+        _company_cache_stats["hits"] += 1
+        return cached
+    _company_cache_stats["misses"] += 1
     
     try:
-        response = await session.get(url)
+        response = await client.get(f"/v1/boards/{slug}/jobs")
+        logger.debug(f"Greenhouse probe for {slug}: {response.status_code} over {response.http_version}")
         
         result = {
             "slug": slug,
@@ -77,7 +115,7 @@ async def test_single_company(slug: str, session: httpx.AsyncClient) -> Dict[str
         
         if response.status_code == 200:
             try:
-                data = response.json()
+                data = orjson.loads(response.content)
                 jobs = data.get("jobs", [])
                 result["success"] = True
                 result["jobs_count"] = len(jobs)
@@ -102,6 +140,10 @@ async def test_single_company(slug: str, session: httpx.AsyncClient) -> Dict[str
             result["error"] = "Rate limited (429)"
         else:
             result["error"] = f"HTTP {response.status_code}"
+        
+        # Only cache definitive answers; rate limits and server errors get retried
+        if result["success"] or response.status_code == 404:
+            _company_result_cache[slug] = result
             
         return result
         
@@ -115,65 +157,51 @@ async def test_single_company(slug: str, session: httpx.AsyncClient) -> Dict[str
             "sample_job": None
         }
 
-@router.post("/discover-greenhouse-companies")
-async def discover_greenhouse_companies(
-    limit: int = 50,  # Limit companies to test to avoid timeouts
-    background_tasks: BackgroundTasks = None
-):
+async def _discover_companies(limit: int, results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Discover which companies use Greenhouse by testing their endpoints.
-    This runs the comprehensive company testing remotely.
+    Test up to `limit` companies and build the discovery report.
+    
+    Per-company results are appended to `results` as soon as each request
+    completes, so callers holding the list can observe progress.
     """
+    cached = _discovery_cache.get(limit)
+    if cached is not None:
+        logger.info(f"Returning cached Greenhouse company discovery results (limit={limit})")
+        cached_response, cached_results = cached
+        results.extend(cached_results)
+        return cached_response
+    
     logger.info(f"Starting comprehensive Greenhouse company discovery (testing {limit} companies)")
     
     # Limit the list to avoid timeouts
     companies_to_test = COMPREHENSIVE_COMPANY_LIST[:limit]
     
-    headers = {
-        "User-Agent": "RushJob/1.0 (Company Discovery)",
-        "Accept": "application/json",
-    }
-    
-    timeout = httpx.Timeout(15.0, connect=5.0)  # Shorter timeouts for web endpoint
+    client = get_greenhouse_client()
     
     start_time = time.time()
-    results = []
     successful_companies = []
     failed_companies = []
     
-    async with httpx.AsyncClient(headers=headers, timeout=timeout) as session:
-        # Test companies in smaller batches for web endpoint
-        batch_size = 5
-        total_batches = (len(companies_to_test) + batch_size - 1) // batch_size
+    # Fan out over every company at once, bounded by a semaphore
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    
+    async def _test_with_limit(slug: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await test_single_company(slug, client)
+    
+    # test_single_company reports request failures in its result dict and never raises
+    for next_result in asyncio.as_completed([_test_with_limit(slug) for slug in companies_to_test]):
+        result = await next_result
+        results.append(result)
         
-        for i in range(0, len(companies_to_test), batch_size):
-            batch = companies_to_test[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            
-            logger.info(f"Testing batch {batch_num}/{total_batches}: {batch}")
-            
-            # Test companies in batch
-            batch_tasks = [test_single_company(slug, session) for slug in batch]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    logger.error(f"Exception testing company: {result}")
-                    continue
-                    
-                results.append(result)
-                
-                if result["success"]:
-                    successful_companies.append({
-                        "name": result["slug"].title().replace("-", " "),
-                        "slug": result["slug"],
-                        "jobs_count": result["jobs_count"]
-                    })
-                else:
-                    failed_companies.append(result)
-            
-            # Small delay between batches
-            await asyncio.sleep(1)
+        if result["success"]:
+            successful_companies.append({
+                "name": _slug_to_name(result["slug"]),
+                "slug": result["slug"],
+                "jobs_count": result["jobs_count"]
+            })
+        else:
+            failed_companies.append(result)
     
     end_time = time.time()
     duration = end_time - start_time
@@ -189,44 +217,118 @@ async def discover_greenhouse_companies(
             "failed": len(failed_companies),
             "success_rate": round(len(successful_companies)/len(results)*100, 1) if results else 0,
             "duration_seconds": round(duration, 1),
-            "companies_tested": companies_to_test
+            "companies_tested": list(companies_to_test)
         },
         "successful_companies": successful_companies,
         "failed_companies": [{"slug": c["slug"], "error": c["error"]} for c in failed_companies],
         "recommendations": {
-            "new_companies_to_add": [
-                c for c in successful_companies 
-                if c["slug"] not in [
-                    "stripe", "airbnb", "robinhood", "peloton", "dropbox", "coinbase", 
-                    "reddit", "lyft", "doordashusa", "pinterest", "databricks", "figma", 
-                    "discord", "twitch", "brex", "instacart", "asana", "flexport", 
-                    "gusto", "checkr", "amplitude", "airtable", "mixpanel", "nextdoor", "thumbtack"
-                ]
-            ][:20],  # Top 20 new companies
+            "new_companies_to_add": list(islice(
+                (c for c in successful_companies if c["slug"] not in EXISTING_GREENHOUSE_SLUGS),
+                20
+            )),  # Top 20 new companies
             "companies_to_remove": [
                 "canva", "shopify", "snowflake"  # Already identified as non-Greenhouse
             ]
         }
     }
     
-    logger.info(f"Company discovery completed: {len(successful_companies)} successful, {len(failed_companies)} failed")
+    _discovery_cache[limit] = (response, list(results))
+    
+    lookups = _company_cache_stats["hits"] + _company_cache_stats["misses"]
+    hit_rate = _company_cache_stats["hits"] / lookups if lookups else 0
+    logger.info(f"Company discovery completed: {len(successful_companies)} successful, {len(failed_companies)} failed "
+                f"(per-company cache hit rate {hit_rate:.0%})")
     
     return response
 
-@router.get("/test-company/{slug}")
-async def test_single_company_endpoint(slug: str):
-    """Test a single company's Greenhouse endpoint quickly."""
+async def _run_discovery(job_id: str, limit: int) -> None:
+    """Background task that runs discovery and records its progress."""
+    job = _discovery_jobs[job_id]
+    try:
+        job["response"] = await _discover_companies(limit, job["results"])
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"Company discovery job {job_id} failed: {e}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+@router.post("/discover-greenhouse-companies")
+async def discover_greenhouse_companies(
+    background_tasks: BackgroundTasks,
+    limit: int = 50  # Limit companies to test to avoid timeouts
+):
+    """
+    Discover which companies use Greenhouse by testing their endpoints.
     
-    headers = {
-        "User-Agent": "RushJob/1.0",
-        "Accept": "application/json",
+    The scan runs in the background; poll
+    GET /discover-greenhouse-companies/{job_id} for progress and results.
+    """
+    job_id = uuid.uuid4().hex
+    _discovery_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "running",
+        "limit": limit,
+        "total": len(COMPREHENSIVE_COMPANY_LIST[:limit]),
+        "results": [],
+        "response": None,
+        "error": None
     }
+    background_tasks.add_task(_run_discovery, job_id, limit)
     
-    async with httpx.AsyncClient(headers=headers, timeout=10.0) as session:
-        result = await test_single_company(slug, session)
-        
+    return {"job_id": job_id, "status": "running"}
+
+@router.get("/discover-greenhouse-companies/{job_id}")
+async def get_discovery_job(job_id: str):
+    """Get progress (and, once finished, results) of a discovery job."""
+    job = _discovery_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Discovery job not found")
+    
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "completed": len(job["results"]),
+        "total": job["total"],
+        "partial_results": job["results"] if job["status"] == "running" else None,
+        "response": job["response"],
+        "error": job["error"]
+    }
+
+async def _test_companies(slugs: List[str]) -> List[Dict[str, Any]]:
+    """
+    Test several companies concurrently over the shared Greenhouse client.
+    """
+    client = get_greenhouse_client()
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    
+    async def test_with_limit(slug: str) -> Dict[str, Any]:
+        async with semaphore:
+            result = await test_single_company(slug, client)
         return {
             "company": slug,
             "result": result,
             "recommendation": "add" if result["success"] and result["jobs_count"] > 0 else "skip"
         }
+    
+    return await asyncio.gather(*(test_with_limit(slug) for slug in slugs))
+
+@router.post("/test-companies")
+async def test_companies(payload: Dict[str, List[str]]):
+    """Test a batch of companies' Greenhouse endpoints in one request."""
+    
+    slugs = payload.get("slugs")
+    if not slugs:
+        raise HTTPException(status_code=400, detail="Request body must include a non-empty 'slugs' list")
+    
+    results = await _test_companies(slugs[:MAX_TEST_COMPANIES])
+    
+    return {"results": results}
+
+@router.get("/test-company/{slug}")
+async def test_single_company_endpoint(slug: str):
+    """Test a single company's Greenhouse endpoint quickly."""
+    
+    results = await _test_companies([slug])
+    
+    return results[0]
+
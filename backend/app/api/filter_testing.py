@@ -1,19 +1,27 @@
 """
 Filter testing endpoints to validate job matching logic.
 """
+import asyncio
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, lambda_stmt
 from loguru import logger
+from cachetools import TTLCache
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal
 from app.models import Job, Company, UserAlert
 from app.services.matcher import JobMatcher
-from app.services.location_matcher import LocationMatcher
+from app.services.location_matcher import get_location_matcher
 
 router = APIRouter()
 
+# Common alert locations used to exercise the matcher against real job data
+_COMMON_LOCATION_PATTERNS = ("Remote", "San Francisco", "New York", "NYC", "SF", "Seattle", "London", "Chicago")
+
+# Coverage counts barely move minute-to-minute; cache them for dashboard polling
+_coverage_counts_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
 @router.get("/test-filters/location-matching")
 async def test_location_matching(db: AsyncSession = Depends(get_db)):
     """Test location matching with real job data."""
@@ -26,16 +34,13 @@ async def test_location_matching(db: AsyncSession = Depends(get_db)):
     )
     jobs_with_companies = result.all()
     
-    location_matcher = LocationMatcher()
+    location_matcher = get_location_matcher()
     test_cases = []
     
     for job, company in jobs_with_companies:
         if job.location:
-            # Test common location patterns
-            test_patterns = ["Remote", "San Francisco", "New York", "NYC", "SF", "Seattle"]
-            
             matches = {}
-            for pattern in test_patterns:
+            for pattern in _COMMON_LOCATION_PATTERNS:
                 matches[pattern] = location_matcher.match_location(job.location, pattern)
             
             test_cases.append({
@@ -73,12 +78,14 @@ async def create_test_alert(
         include_remote=alert_criteria.get("include_remote", True)
     )
     
-    # Get recent jobs to test against
+    # Get recent jobs to test against (lambda_stmt caches the compiled SQL across requests)
     jobs_result = await db.execute(
-        select(Job, Company).join(Company)
-        .where(Job.is_active == True)
-        .order_by(Job.first_seen_at.desc())
-        .limit(100)
+        lambda_stmt(
+            lambda: select(Job, Company).join(Company)
+            .where(Job.is_active == True)
+            .order_by(Job.first_seen_at.desc())
+            .limit(100)
+        )
     )
     jobs_with_companies = jobs_result.all()
     
@@ -88,9 +95,8 @@ async def create_test_alert(
     non_matching_jobs = []
     
     for job, company in jobs_with_companies:
-        job.company = company  # Add company relation for matching
-        
-        if await matcher._job_matches_alert(job, test_alert):
+        # Company is already joined, so matching needs no further queries
+        if matcher.matches_alert(job, test_alert, company.slug):
             matching_jobs.append({
                 "id": job.id,
                 "title": job.title,
@@ -117,14 +123,48 @@ async def create_test_alert(
         "sample_non_matching": non_matching_jobs[:10]  # First 10 non-matches
     }
 
+async def _get_coverage_counts() -> Dict[str, int]:
+    """
+    Get active-job field coverage counts, cached briefly for dashboard polling.
+    
+    Uses its own session so it can run concurrently with the request's queries.
+    """
+    cached = _coverage_counts_cache.get("counts")
+    if cached is not None:
+        return cached
+    
+    # Get stats on data completeness in a single round-trip
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(
+                func.count(Job.id).label("total"),
+                func.count(Job.id).filter(Job.location.isnot(None), Job.location != "").label("with_location"),
+                func.count(Job.id).filter(Job.department.isnot(None), Job.department != "").label("with_department"),
+                func.count(Job.id).filter(Job.job_type.isnot(None), Job.job_type != "").label("with_job_type"),
+            ).where(Job.is_active == True)
+        )
+        row = result.one()
+    counts = {key: value or 0 for key, value in row._mapping.items()}
+    
+    _coverage_counts_cache["counts"] = counts
+    return counts
+
 @router.get("/test-filters/data-quality")
 async def test_data_quality(db: AsyncSession = Depends(get_db)):
     """Test data quality and parsing accuracy."""
     
     try:
-        # Get stats on data completeness
-        total_jobs = await db.execute(select(func.count(Job.id)).where(Job.is_active == True))
-        total_count = total_jobs.scalar() or 0
+        # Coverage counts and the review sample are independent, so fetch them concurrently
+        counts, sample_jobs = await asyncio.gather(
+            _get_coverage_counts(),
+            db.execute(
+                select(Job, Company).join(Company)
+                .where(Job.is_active == True)
+                .order_by(Job.first_seen_at.desc())
+                .limit(20)
+            )
+        )
+        total_count = counts["total"]
         
         if total_count == 0:
             return {
@@ -141,31 +181,11 @@ async def test_data_quality(db: AsyncSession = Depends(get_db)):
                 "sample_jobs": []
             }
         
-        # Jobs with various fields populated
-        jobs_with_location = await db.execute(
-            select(func.count(Job.id)).where(Job.is_active == True, Job.location.isnot(None), Job.location != "")
-        )
-        
-        jobs_with_department = await db.execute(
-            select(func.count(Job.id)).where(Job.is_active == True, Job.department.isnot(None), Job.department != "")
-        )
-        
-        jobs_with_job_type = await db.execute(
-            select(func.count(Job.id)).where(Job.is_active == True, Job.job_type.isnot(None), Job.job_type != "")
-        )
-        
-        location_count = jobs_with_location.scalar() or 0
-        department_count = jobs_with_department.scalar() or 0
-        job_type_count = jobs_with_job_type.scalar() or 0
+        location_count = counts["with_location"]
+        department_count = counts["with_department"]
+        job_type_count = counts["with_job_type"]
         
         # Sample of jobs for manual review
-        sample_jobs = await db.execute(
-            select(Job, Company).join(Company)
-            .where(Job.is_active == True)
-            .order_by(Job.first_seen_at.desc())
-            .limit(20)
-        )
-        
         sample_data = []
         for job, company in sample_jobs.all():
             sample_data.append({
@@ -213,7 +233,7 @@ async def test_location_patterns(db: AsyncSession = Depends(get_db)):
         .limit(50)
     )
     
-    location_matcher = LocationMatcher()
+    location_matcher = get_location_matcher()
     location_analysis = []
     
     for location, count in locations_result.all():
@@ -222,8 +242,7 @@ async def test_location_patterns(db: AsyncSession = Depends(get_db)):
         
         # Test matching against common patterns
         test_matches = {}
-        test_patterns = ["Remote", "San Francisco", "New York", "London", "Seattle", "Chicago"]
-        for pattern in test_patterns:
+        for pattern in _COMMON_LOCATION_PATTERNS:
             test_matches[pattern] = location_matcher.match_location(location, pattern)
         
         location_analysis.append({
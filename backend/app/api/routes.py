@@ -2,63 +2,151 @@
 API routes for RushJob.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import select, func, text, insert, update, delete, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload
 from loguru import logger
+from pydantic import TypeAdapter
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.http_clients import get_greenhouse_client
+from app.core.responses import ORJSONResponse
 from app.models import Company, UserAlert, Job
 from app.schemas.alerts import UserAlertCreate, UserAlertResponse, UserAlertUpdate
 from app.schemas.companies import CompanyResponse
 from app.schemas.jobs import JobResponse, JobResponseSimple
-from app.services.greenhouse import VERIFIED_GREENHOUSE_COMPANIES, GreenhouseClient
+from app.services.greenhouse import VERIFIED_GREENHOUSE_COMPANIES, VERIFIED_GREENHOUSE_SLUGS, GreenhouseClient
 from app.services.discord import DiscordNotifier
 from app.services.poller import JobPollingService
 
 
 router = APIRouter()
 
+# Job columns backing JobResponseSimple, for column-only list queries
+JOB_SIMPLE_COLUMNS = tuple(getattr(Job, field) for field in JobResponseSimple.model_fields)
+
+# Bytes of the upstream body returned by /debug/raw-stripe
+RAW_PREVIEW_BYTES = 500
+
+# Upper bound on rows a single /jobs request may ask for, so the buffered
+# result stays small regardless of the requested limit
+MAX_JOBS_LIMIT = 500
+
+# Built once at import so list endpoints validate and serialize rows in a
+# single pydantic pass, without a per-request schema lookup
+_ALERT_LIST_ADAPTER = TypeAdapter(List[UserAlertResponse])
+_COMPANY_LIST_ADAPTER = TypeAdapter(List[CompanyResponse])
+_JOB_LIST_ADAPTER = TypeAdapter(List[JobResponseSimple])
+
+
+def _err(e: BaseException, **extra) -> ORJSONResponse:
+    """Build the error response used by the debug endpoints."""
+    return ORJSONResponse(
+        {**extra, "error": str(e), "error_type": e.__class__.__name__},
+        status_code=500
+    )
+
+
+def get_poller(request: Request) -> JobPollingService:
+    """Get the app-wide polling service created at startup."""
+    return request.app.state.poller
+
+
+def get_discord(request: Request) -> DiscordNotifier:
+    """Get the app-wide Discord notifier backed by the shared HTTP client."""
+    return request.app.state.discord
+
+
+def _list_response(adapter: TypeAdapter, rows) -> Response:
+    """Validate ORM rows against a list schema and render them straight to JSON bytes."""
+    return Response(
+        adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+        media_type="application/json"
+    )
+
+
+def _alert_response(alert: UserAlert) -> ORJSONResponse:
+    """
+    Serialize a just-written alert without re-validating it.
+    
+    The row was built from an already validated request, so response model
+    validation is only run in debug mode as a consistency check.
+    """
+    if settings.debug:
+        return ORJSONResponse(UserAlertResponse.model_validate(alert).model_dump(mode="json"))
+    return ORJSONResponse({field: getattr(alert, field) for field in UserAlertResponse.model_fields})
+
+
+async def _load_alert(alert_id: int, db: AsyncSession = Depends(get_db)) -> UserAlert:
+    """Dependency: the alert for the path's alert_id, or a 404."""
+    result = await db.execute(
+        select(UserAlert).where(UserAlert.id == alert_id)
+    )
+    alert = result.scalar_one_or_none()
+    
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    
+    return alert
+
 
 # Companies endpoints
-@router.get("/companies", response_model=List[CompanyResponse])
+@router.get("/companies", response_model=None, responses={200: {"model": List[CompanyResponse]}})
 async def get_companies(db: AsyncSession = Depends(get_db)):
     """Get list of available companies to monitor."""
+    # Response schemas are flat; raiseload makes an accidental relationship
+    # access fail loudly instead of lazy-loading once per row
     result = await db.execute(
         select(Company).where(Company.is_active == True).order_by(Company.name)
+        .options(raiseload("*"))
     )
     companies = result.scalars().all()
-    return companies
+    return _list_response(_COMPANY_LIST_ADAPTER, companies)
 
 
 @router.post("/companies/seed")
 async def seed_companies(db: AsyncSession = Depends(get_db)):
     """Seed database with verified Greenhouse companies."""
     try:
-        added_companies = []
+        # Find which verified companies already exist, for reporting
+        result = await db.execute(
+            select(Company.slug).where(Company.slug.in_(VERIFIED_GREENHOUSE_SLUGS))
+        )
+        existing_slugs = set(result.scalars().all())
         
-        for company_data in VERIFIED_GREENHOUSE_COMPANIES:
-            # Check if company already exists
-            result = await db.execute(
-                select(Company).where(Company.slug == company_data["slug"])
-            )
-            existing_company = result.scalar_one_or_none()
-            
-            if not existing_company:
-                company = Company(
-                    name=company_data["name"],
-                    slug=company_data["slug"],
-                    ats_type="greenhouse",
-                    api_endpoint=f"https://boards-api.greenhouse.io/v1/boards/{company_data['slug']}/jobs"
-                )
-                db.add(company)
-                added_companies.append(company_data["name"])
+        rows = [
+            {
+                "name": name,
+                "slug": slug,
+                "ats_type": "greenhouse",
+                "api_endpoint": f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
+            }
+            for name, slug in VERIFIED_GREENHOUSE_COMPANIES
+        ]
+        added_companies = [row["name"] for row in rows if row["slug"] not in existing_slugs]
+        
+        # Insert new companies and refresh name/endpoint on existing ones in one statement
+        stmt = pg_insert(Company).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["slug"],
+            set_={
+                "name": stmt.excluded.name,
+                "api_endpoint": stmt.excluded.api_endpoint,
+                "updated_at": func.now()
+            }
+        )
+        await db.execute(stmt)
         
         await db.commit()
         
         return {
             "message": f"Added {len(added_companies)} companies",
-            "companies": added_companies
+            "companies": added_companies,
+            "refreshed": len(existing_slugs)
         }
     except Exception as e:
         logger.error(f"Error seeding companies: {e}")
@@ -83,11 +171,7 @@ async def debug_database():
                 "test_query_result": test_result
             }
     except Exception as e:
-        return {
-            "database_connection": "failed",
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
+        return _err(e, database_connection="failed")
 
 
 @router.post("/companies/update-slugs")
@@ -98,17 +182,37 @@ async def update_company_slugs(db: AsyncSession = Depends(get_db)):
             ("doordash", "doordashusa"),  # Fix DoorDash slug
         ]
         
-        updated_companies = []
-        for old_slug, new_slug in updates:
-            result = await db.execute(
-                select(Company).where(Company.slug == old_slug)
+        # Look up which old slugs exist in one query
+        result = await db.execute(
+            select(Company.slug, Company.name).where(
+                Company.slug.in_([old_slug for old_slug, _ in updates])
+            )
+        )
+        names_by_slug = dict(result.all())
+        
+        params = [
+            {
+                "old_slug": old_slug,
+                "new_slug": new_slug,
+                "new_endpoint": f"https://boards-api.greenhouse.io/v1/boards/{new_slug}/jobs"
+            }
+            for old_slug, new_slug in updates
+            if old_slug in names_by_slug
+        ]
+        updated_companies = [
+            f"{names_by_slug[row['old_slug']]}: {row['old_slug']} -> {row['new_slug']}"
+            for row in params
+        ]
+        
+        if params:
+            # Core table update so the parameter list runs as a single executemany
+            companies_table = Company.__table__
+            await db.execute(
+                update(companies_table)
+                .where(companies_table.c.slug == bindparam("old_slug"))
+                .values(slug=bindparam("new_slug"), api_endpoint=bindparam("new_endpoint")),
+                params
             )
-            company = result.scalar_one_or_none()
-            
-            if company:
-                company.slug = new_slug
-                company.api_endpoint = f"https://boards-api.greenhouse.io/v1/boards/{new_slug}/jobs"
-                updated_companies.append(f"{company.name}: {old_slug} -> {new_slug}")
         
         await db.commit()
         
@@ -152,31 +256,31 @@ async def test_stripe_directly():
             } if jobs else None
         }
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
+        return _err(e, success=False)
 
 
 @router.get("/debug/raw-stripe")
 async def debug_raw_stripe():
     """Test raw Stripe API response."""
     try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://boards-api.greenhouse.io/v1/boards/stripe/jobs")
+        client = get_greenhouse_client()
+        # Only read enough of the (often >1 MB) body for the preview
+        async with client.stream("GET", "/v1/boards/stripe/jobs", timeout=5.0) as response:
+            preview = b""
+            async for chunk in response.aiter_bytes():
+                preview += chunk
+                if len(preview) > RAW_PREVIEW_BYTES:
+                    break
+            
+            response_text = preview[:RAW_PREVIEW_BYTES].decode("utf-8", "replace")
             return {
                 "status_code": response.status_code,
                 "headers": dict(response.headers),
                 "content_type": response.headers.get("content-type"),
-                "response_text": response.text[:500] + "..." if len(response.text) > 500 else response.text
+                "response_text": response_text + "..." if len(preview) > RAW_PREVIEW_BYTES else response_text
             }
     except Exception as e:
-        return {
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
+        return _err(e)
 
 
 @router.get("/debug/test-matching/{alert_id}")
@@ -195,13 +299,13 @@ async def test_alert_matching(
         if not alert:
             return {"error": "Alert not found"}
         
-        # Get some recent jobs to test against
+        # Get some recent jobs to test against, with their company slugs
         jobs_result = await db.execute(
-            select(Job).where(Job.is_active == True)
+            select(Job, Company.slug).join(Company, Job.company_id == Company.id)
+            .where(Job.is_active == True)
             .order_by(Job.first_seen_at.desc())
             .limit(20)
         )
-        jobs = jobs_result.scalars().all()
         
         # Test matching
         from app.services.matcher import JobMatcher
@@ -210,8 +314,8 @@ async def test_alert_matching(
         matching_jobs = []
         non_matching_jobs = []
         
-        for job in jobs:
-            if await matcher._job_matches_alert(job, alert):
+        for job, company_slug in jobs_result:
+            if matcher.matches_alert(job, alert, company_slug):
                 matching_jobs.append({
                     "id": job.id,
                     "title": job.title,
@@ -242,18 +346,16 @@ async def test_alert_matching(
         }
         
     except Exception as e:
-        return {
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
+        return _err(e)
 
 
 # User alerts endpoints
-@router.post("/alerts", response_model=UserAlertResponse)
+@router.post("/alerts", response_model=None, responses={200: {"model": UserAlertResponse}})
 async def create_alert(
     alert_data: UserAlertCreate,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    polling_service: JobPollingService = Depends(get_poller)
 ):
     """Create a new job alert."""
     try:
@@ -264,8 +366,8 @@ async def create_alert(
             # Skip validation for now since the URL works in testing
             pass
         
-        # Create alert
-        alert = UserAlert(
+        # Create alert, getting server defaults back via RETURNING instead of a refresh
+        stmt = insert(UserAlert).values(
             user_id=alert_data.user_id,
             name=alert_data.name,
             company_slugs=alert_data.company_slugs,
@@ -278,21 +380,20 @@ async def create_alert(
             discord_webhook_url=str(alert_data.discord_webhook_url) if alert_data.discord_webhook_url else None,
             email_address=alert_data.email_address,
             notification_frequency=alert_data.notification_frequency
-        )
+        ).returning(UserAlert)
         
         logger.info("Adding alert to database")
-        db.add(alert)
+        alert = (await db.execute(stmt)).scalar_one()
         await db.commit()
-        await db.refresh(alert)
         
         logger.info(f"Alert created with ID: {alert.id}")
         
         # Send initial notification in background
         if alert.discord_webhook_url:
             logger.info("Scheduling initial notification")
-            background_tasks.add_task(send_initial_notification, alert.id)
+            background_tasks.add_task(send_initial_notification, alert, polling_service)
         
-        return alert
+        return _alert_response(alert)
         
     except Exception as e:
         logger.error(f"Error creating alert: {e}")
@@ -303,7 +404,7 @@ async def create_alert(
         )
 
 
-@router.get("/alerts", response_model=List[UserAlertResponse])
+@router.get("/alerts", response_model=None, responses={200: {"model": List[UserAlertResponse]}})
 async def get_user_alerts(
     user_id: str,
     db: AsyncSession = Depends(get_db)
@@ -313,48 +414,32 @@ async def get_user_alerts(
         select(UserAlert)
         .where(UserAlert.user_id == user_id)
         .order_by(UserAlert.created_at.desc())
+        .options(raiseload("*"))
     )
     alerts = result.scalars().all()
-    return alerts
+    return _list_response(_ALERT_LIST_ADAPTER, alerts)
 
 
 @router.get("/alerts/{alert_id}", response_model=UserAlertResponse)
 async def get_alert(
     alert_id: int,
-    db: AsyncSession = Depends(get_db)
+    alert: UserAlert = Depends(_load_alert)
 ):
     """Get a specific alert by ID."""
-    result = await db.execute(
-        select(UserAlert).where(UserAlert.id == alert_id)
-    )
-    alert = result.scalar_one_or_none()
-    
-    if not alert:
-        raise HTTPException(status_code=404, detail="Alert not found")
-    
     return alert
 
 
-@router.put("/alerts/{alert_id}", response_model=UserAlertResponse)
+@router.put("/alerts/{alert_id}", response_model=None, responses={200: {"model": UserAlertResponse}})
 async def update_alert(
     alert_id: int,
     alert_data: UserAlertUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    discord_notifier: DiscordNotifier = Depends(get_discord)
 ):
     """Update an existing alert."""
-    result = await db.execute(
-        select(UserAlert).where(UserAlert.id == alert_id)
-    )
-    alert = result.scalar_one_or_none()
-    
-    if not alert:
-        raise HTTPException(status_code=404, detail="Alert not found")
-    
-    # Validate Discord webhook if provided
+    # Validate Discord webhook first so no DB work waits on the external call
     if alert_data.discord_webhook_url:
-        discord_notifier = DiscordNotifier()
-        is_valid = await discord_notifier.test_webhook(alert_data.discord_webhook_url)
-        await discord_notifier.close()
+        is_valid = await discord_notifier.test_webhook(str(alert_data.discord_webhook_url))
         
         if not is_valid:
             raise HTTPException(
@@ -363,14 +448,25 @@ async def update_alert(
             )
     
     # Update fields
-    update_data = alert_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(alert, field, value)
+    update_data = alert_data.model_dump(mode="json", exclude_unset=True)
+    if not update_data:
+        return _alert_response(await _load_alert(alert_id, db))
+    
+    # Existence check and update in one round-trip
+    result = await db.execute(
+        update(UserAlert)
+        .where(UserAlert.id == alert_id)
+        .values(**update_data)
+        .returning(UserAlert)
+    )
+    alert = result.scalar_one_or_none()
+    
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
     
     await db.commit()
-    await db.refresh(alert)
     
-    return alert
+    return _alert_response(alert)
 
 
 @router.delete("/alerts/{alert_id}")
@@ -380,14 +476,12 @@ async def delete_alert(
 ):
     """Delete an alert."""
     result = await db.execute(
-        select(UserAlert).where(UserAlert.id == alert_id)
+        delete(UserAlert).where(UserAlert.id == alert_id).returning(UserAlert.id)
     )
-    alert = result.scalar_one_or_none()
     
-    if not alert:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    await db.delete(alert)
     await db.commit()
     
     return {"message": "Alert deleted successfully"}
@@ -395,16 +489,27 @@ async def delete_alert(
 
 @router.get("/debug/jobs-count")
 async def debug_jobs_count(db: AsyncSession = Depends(get_db)):
-    """Simple endpoint to check job count."""
+    """
+    Simple endpoint to check job count.
+    
+    Counts all job rows, active or not. On Postgres the value is the planner's
+    estimate rather than an exact count, hence the key name on every dialect.
+    """
     try:
-        from sqlalchemy import func
-        result = await db.execute(
-            select(func.count(Job.id)).where(Job.is_active == True)
-        )
-        count = result.scalar()
-        return {"total_jobs": count}
+        if db.bind.dialect.name == "postgresql":
+            # O(1) estimate from table statistics instead of scanning jobs.
+            # reltuples is -1 until the table has been vacuumed/analyzed.
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'jobs'")
+            )
+            estimate = result.scalar()
+            if estimate is not None and estimate >= 0:
+                return {"total_jobs_estimate": estimate}
+        
+        result = await db.execute(select(func.count(Job.id)))
+        return {"total_jobs_estimate": result.scalar()}
     except Exception as e:
-        return {"error": str(e)}
+        return _err(e)
 
 
 @router.get("/debug/jobs-simple")
@@ -417,38 +522,34 @@ async def debug_jobs_simple(limit: int = 5, db: AsyncSession = Depends(get_db)):
             .order_by(Job.first_seen_at.desc())
             .limit(limit)
         )
-        jobs = result.all()
-        return {"jobs": [dict(row._mapping) for row in jobs]}
+        return ORJSONResponse({"jobs": [dict(row) for row in result.mappings()]})
     except Exception as e:
-        return {"error": str(e)}
+        return _err(e)
 
 
 # Jobs endpoints
 @router.get("/jobs", response_model=List[JobResponseSimple])
 async def get_jobs(
     company_slugs: Optional[str] = None,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_JOBS_LIMIT),
     db: AsyncSession = Depends(get_db)
 ):
     """Get recent jobs, optionally filtered by company."""
     try:
-        query = select(Job).where(Job.is_active == True)
+        # Only fetch the columns the response needs and skip ORM hydration
+        query = select(*JOB_SIMPLE_COLUMNS).where(Job.is_active == True)
         
         if company_slugs:
             slug_list = company_slugs.split(",")
-            companies_result = await db.execute(
-                select(Company).where(Company.slug.in_(slug_list))
+            query = query.join(Company, Job.company_id == Company.id).where(
+                Company.slug.in_(slug_list)
             )
-            companies = companies_result.scalars().all()
-            company_ids = [c.id for c in companies]
-            query = query.where(Job.company_id.in_(company_ids))
         
         query = query.order_by(Job.first_seen_at.desc()).limit(limit)
         
         result = await db.execute(query)
-        jobs = result.scalars().all()
         
-        return jobs
+        return _list_response(_JOB_LIST_ADAPTER, result.mappings().all())
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}")
         raise HTTPException(
@@ -464,7 +565,7 @@ async def get_job(
 ):
     """Get a specific job by ID."""
     result = await db.execute(
-        select(Job).where(Job.id == job_id)
+        select(Job).where(Job.id == job_id).options(raiseload("*"))
     )
     job = result.scalar_one_or_none()
     
@@ -476,11 +577,12 @@ async def get_job(
 
 # Utility endpoints
 @router.post("/test-webhook")
-async def test_discord_webhook(webhook_url: str):
+async def test_discord_webhook(
+    webhook_url: str,
+    discord_notifier: DiscordNotifier = Depends(get_discord)
+):
     """Test a Discord webhook URL."""
-    discord_notifier = DiscordNotifier()
     is_valid = await discord_notifier.test_webhook(webhook_url)
-    await discord_notifier.close()
     
     if is_valid:
         return {"message": "Webhook test successful"}
@@ -492,12 +594,10 @@ async def test_discord_webhook(webhook_url: str):
 
 
 @router.post("/poll-now")
-async def trigger_poll():
+async def trigger_poll(polling_service: JobPollingService = Depends(get_poller)):
     """Manually trigger a polling cycle (for development/testing)."""
     try:
-        polling_service = JobPollingService()
         stats = await polling_service.poll_once()
-        await polling_service.close()
         
         return {
             "message": "Polling completed successfully",
@@ -512,21 +612,13 @@ async def trigger_poll():
 
 
 # Background task functions
-async def send_initial_notification(alert_id: int):
+async def send_initial_notification(alert: UserAlert, polling_service: JobPollingService):
     """Send initial notification for a new alert."""
     try:
-        from app.core.database import AsyncSessionLocal
-        
         async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(UserAlert).where(UserAlert.id == alert_id)
-            )
-            alert = result.scalar_one_or_none()
-            
-            if alert:
-                polling_service = JobPollingService()
-                await polling_service.send_initial_alert_notification(db, alert)
-                await polling_service.close()
+            # The alert is fully loaded by create_alert; attach it without a SELECT
+            alert = await db.merge(alert, load=False)
+            await polling_service.send_initial_alert_notification(db, alert)
                 
     except Exception as e:
-        logger.error(f"Error sending initial notification for alert {alert_id}: {e}")
\ No newline at end of file
+        logger.error(f"Error sending initial notification for alert {alert.id}: {e}")
\ No newline at end of file
@@ -2,47 +2,71 @@
 Command-line interface for RushJob.
 """
 import asyncio
+import os
+import sys
 from typing import Optional
 import typer
-from loguru import logger
 
-from app.core.database import init_db, AsyncSessionLocal
-from app.services.poller import JobPollingService
-from app.services.greenhouse import GreenhouseClient, VERIFIED_GREENHOUSE_COMPANIES
-from app.models import Company
+# Application modules (settings, DB engine, HTTP clients) are imported inside
+# each command so that --help and shell completion stay fast.
 
 app = typer.Typer(help="RushJob CLI - Job alert system")
 
 
-@app.command()
+@app.callback()
+def callback():
+    """RushJob CLI - Job alert system"""
+    # Keeps typer in multi-command mode even when only one command is registered
+
+
+def _get_logger():
+    """Import and configure the logger on first use."""
+    from loguru import logger
+    from app.core.logging import configure_logging
+    configure_logging()
+    return logger
+
+
 def init():
     """Initialize the database with tables and seed data."""
     async def _init():
+        from app.core.database import init_db, AsyncSessionLocal
+        from app.services.greenhouse import VERIFIED_GREENHOUSE_COMPANIES
+        from app.models import Company
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        logger = _get_logger()
+        
         logger.info("Initializing database...")
         await init_db()
         logger.info("Database tables created")
         
-        # Seed companies
+        # Seed companies in one statement; re-running init skips existing slugs
         async with AsyncSessionLocal() as db:
-            for company_data in VERIFIED_GREENHOUSE_COMPANIES:
-                company = Company(
-                    name=company_data["name"],
-                    slug=company_data["slug"],
-                    ats_type="greenhouse",
-                    api_endpoint=f"https://boards-api.greenhouse.io/v1/boards/{company_data['slug']}/jobs"
-                )
-                db.add(company)
+            rows = [
+                {
+                    "name": name,
+                    "slug": slug,
+                    "ats_type": "greenhouse",
+                    "api_endpoint": f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
+                }
+                for name, slug in VERIFIED_GREENHOUSE_COMPANIES
+            ]
+            result = await db.execute(
+                pg_insert(Company).values(rows).on_conflict_do_nothing(index_elements=["slug"])
+            )
             
             await db.commit()
-            logger.info(f"Seeded {len(VERIFIED_GREENHOUSE_COMPANIES)} companies")
+            logger.info(f"Seeded {result.rowcount} companies")
     
     asyncio.run(_init())
 
 
-@app.command()
 def poll():
     """Run a single polling cycle."""
     async def _poll():
+        from app.services.poller import JobPollingService
+        logger = _get_logger()
+        
         polling_service = JobPollingService()
         try:
             logger.info("Starting manual poll...")
@@ -54,10 +78,78 @@ def poll():
     asyncio.run(_poll())
 
 
-@app.command()
+def rehash(batch_size: int = 1000):
+    """Recompute stored job content hashes (run once after changing the hash function)."""
+    async def _rehash():
+        from sqlalchemy import select, update, bindparam
+        from app.core.database import AsyncSessionLocal
+        from app.models import Job
+        from app.services.greenhouse import compute_content_hash
+        logger = _get_logger()
+        
+        total = 0
+        last_id = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                result = await db.execute(
+                    select(Job.id, Job.title, Job.location, Job.department, Job.job_type)
+                    .where(Job.id > last_id)
+                    .order_by(Job.id)
+                    .limit(batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                
+                await db.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == bindparam("job_id"))
+                    .values(content_hash=bindparam("new_hash")),
+                    [
+                        {"job_id": row.id, "new_hash": compute_content_hash(row.title, row.location, row.department, row.job_type)}
+                        for row in rows
+                    ]
+                )
+                await db.commit()
+                
+                total += len(rows)
+                last_id = rows[-1].id
+        
+        logger.info(f"Rehashed {total} jobs")
+    
+    asyncio.run(_rehash())
+
+
+def worker():
+    """Run the polling scheduler until interrupted (separate from the API server)."""
+    async def _worker():
+        from app.core.config import get_settings
+        from app.core.database import prewarm_db, close_db
+        from app.core.http_clients import close_http_clients
+        from app.core.logging import configure_logging
+        from app.services.poller import PollingScheduler
+        
+        configure_logging()
+        settings = get_settings()
+        await prewarm_db(settings.max_concurrent_polls)
+        
+        scheduler = PollingScheduler()
+        try:
+            await scheduler.start_polling(settings.default_poll_interval_minutes)
+        finally:
+            await scheduler.stop_polling()
+            await close_http_clients()
+            await close_db()
+    
+    asyncio.run(_worker())
+
+
 def test_company(slug: str):
     """Test if a company has a valid Greenhouse endpoint."""
     async def _test():
+        from app.services.greenhouse import GreenhouseClient
+        logger = _get_logger()
+        
         client = GreenhouseClient()
         try:
             logger.info(f"Testing {slug}...")
@@ -72,7 +164,6 @@ def test_company(slug: str):
     asyncio.run(_test())
 
 
-@app.command()
 def serve(
     host: str = "0.0.0.0",
     port: int = 8000,
@@ -88,5 +179,30 @@ def serve(
     )
 
 
+_COMMANDS = {
+    "init": init,
+    "poll": poll,
+    "worker": worker,
+    "rehash": rehash,
+    "test-company": test_company,
+    "serve": serve,
+}
+
+
+def main() -> None:
+    """CLI entry point: register only the invoked command when it can be told from argv."""
+    command = _COMMANDS.get(sys.argv[1]) if len(sys.argv) > 1 else None
+    
+    # Top-level help, shell completion and unknown commands need the full set
+    completing = any(key.startswith("_") and key.endswith("_COMPLETE") for key in os.environ)
+    if command is None or completing:
+        for func in _COMMANDS.values():
+            app.command()(func)
+    else:
+        app.command()(command)
+    
+    app()
+
+
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    main()
\ No newline at end of file
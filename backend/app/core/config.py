@@ -1,7 +1,7 @@
 """
 Core configuration for RushJob backend.
 """
-import os
+from functools import lru_cache
 from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -15,23 +15,22 @@ class Settings(BaseSettings):
     app_version: str = "0.1.0"
     debug: bool = False
     
-    # Database - check both upper and lowercase
+    # Env vars are matched case-insensitively, so DATABASE_URL and database_url both work
     database_url: str = Field(
-        default_factory=lambda: os.getenv('DATABASE_URL') or os.getenv('database_url'),
         description="PostgreSQL connection string"
     )
+    # Per-connection prepared statement cache size for asyncpg
+    # (set to 0 behind PgBouncer in transaction pooling mode)
+    db_statement_cache_size: int = 1024
     
-    # Supabase - check both upper and lowercase  
+    # Supabase
     supabase_url: str = Field(
-        default_factory=lambda: os.getenv('SUPABASE_URL') or os.getenv('supabase_url'),
         description="Supabase project URL"
     )
     supabase_anon_key: str = Field(
-        default_factory=lambda: os.getenv('SUPABASE_ANON_KEY') or os.getenv('supabase_anon_key'),
         description="Supabase anonymous key"
     )
     supabase_service_key: str = Field(
-        default_factory=lambda: os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('supabase_service_key'),
         description="Supabase service role key"
     )
     
@@ -41,7 +40,17 @@ class Settings(BaseSettings):
     
     # Job Polling
     default_poll_interval_minutes: int = 15
+    # Per-company backoff: each consecutive poll without changes multiplies the
+    # company's interval by poll_interval_factor, up to max_poll_interval_minutes
+    max_poll_interval_minutes: int = 240
+    # Cap for boards that are empty or gone (404), which rarely come back soon
+    max_dead_poll_interval_minutes: int = 1440
+    poll_interval_factor: float = 2.0
+    poll_jitter_seconds: int = 60
     max_concurrent_polls: int = 5
+    # Run the polling scheduler inside the API process; normally it runs
+    # as a separate `rushjob worker` process
+    run_poller_in_web: bool = False
     request_timeout_seconds: int = 30
     
     # Rate Limiting
@@ -56,13 +65,14 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = False
-        # Also check uppercase versions for Railway
         env_prefix = ""
-        
-        @classmethod
-        def parse_env_var(cls, field_name: str, raw_val: str) -> any:
-            return raw_val
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, loading them from the environment once."""
+    return Settings()
+
+
+# Global settings instance (kept for existing `from app.core.config import settings` imports)
+settings = get_settings()
\ No newline at end of file
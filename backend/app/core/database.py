@@ -1,27 +1,53 @@
 """
 Database connection and session management.
 """
+import asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
-from app.core.config import settings
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from app.core.config import get_settings
 from app.models import Base
 
+settings = get_settings()
+
+
+# Keep hot parameterized queries (alert/job lookups by id) prepared per connection
+connect_args = {}
+if "asyncpg" in settings.database_url:
+    connect_args = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+# Pool sizing for Postgres: enough warm connections for concurrent polls plus
+# API traffic; LIFO reuse keeps recently used connections hot
+if "sqlite" in settings.database_url:
+    pool_args = {"poolclass": NullPool}
+else:
+    pool_args = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.max_concurrent_polls * 2,
+        "max_overflow": settings.max_concurrent_polls,
+        "pool_use_lifo": True,
+    }
 
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    poolclass=NullPool if "sqlite" in settings.database_url else None,
     pool_pre_ping=True,
     pool_recycle=300,
+    connect_args=connect_args,
+    **pool_args,
 )
 
-# Create session factory
+# Create session factory. Autoflush is off so reads don't each trigger a flush
+# round-trip; code that needs pending rows visible (or their IDs) flushes explicitly.
 AsyncSessionLocal = async_sessionmaker(
     engine, 
     class_=AsyncSession, 
-    expire_on_commit=False
+    expire_on_commit=False,
+    autoflush=False
 )
 
 
@@ -35,8 +61,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def init_db() -> None:
@@ -47,6 +71,21 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def prewarm_db(connections: int) -> None:
+    """
+    Open pool connections up front so the first requests and polls don't pay
+    the connect cost. Returning them to the pool keeps them open.
+    
+    Args:
+        connections: Number of connections to open concurrently
+    """
+    if isinstance(engine.pool, NullPool):
+        return
+    
+    conns = await asyncio.gather(*(engine.connect().start() for _ in range(connections)))
+    await asyncio.gather(*(conn.close() for conn in conns))
+
+
 async def close_db() -> None:
     """
     Close database connections.
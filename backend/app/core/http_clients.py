@@ -0,0 +1,62 @@
+"""
+Shared HTTP clients for outbound API calls.
+"""
+from typing import Optional
+import httpx
+
+
+GREENHOUSE_API_BASE_URL = "https://boards-api.greenhouse.io"
+
+# Process-wide client so connections (and TLS sessions) are reused across requests
+_greenhouse_client: Optional[httpx.AsyncClient] = None
+_discord_client: Optional[httpx.AsyncClient] = None
+
+
+def get_greenhouse_client() -> httpx.AsyncClient:
+    """
+    Get the shared Greenhouse HTTP client, creating it on first use.
+    """
+    global _greenhouse_client
+    if _greenhouse_client is None or _greenhouse_client.is_closed:
+        _greenhouse_client = httpx.AsyncClient(
+            base_url=GREENHOUSE_API_BASE_URL,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            headers={
+                "User-Agent": "RushJob/1.0",
+                "Accept": "application/json",
+            },
+        )
+    return _greenhouse_client
+
+
+def get_discord_client() -> httpx.AsyncClient:
+    """
+    Get the shared Discord webhook HTTP client, creating it on first use.
+    """
+    global _discord_client
+    if _discord_client is None or _discord_client.is_closed:
+        _discord_client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _discord_client
+
+
+async def close_http_clients() -> None:
+    """
+    Close shared HTTP clients.
+    """
+    global _greenhouse_client, _discord_client
+    if _greenhouse_client is not None:
+        await _greenhouse_client.aclose()
+        _greenhouse_client = None
+    if _discord_client is not None:
+        await _discord_client.aclose()
+        _discord_client = None
@@ -0,0 +1,38 @@
+"""
+Logging configuration for RushJob.
+"""
+import sys
+from loguru import logger
+
+from app.core.config import get_settings
+
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+_configured = False
+
+
+def configure_logging() -> None:
+    """
+    Replace loguru's default handler with the app's stdout sink, once per process.
+    
+    Safe to call from every entry point (API lifespan, CLI commands); repeated
+    calls, e.g. a second lifespan run under --reload, don't stack handlers.
+    Records are written from a background thread (enqueue=True) so sink I/O
+    doesn't block the event loop.
+    """
+    global _configured
+    if _configured:
+        return
+    
+    logger.remove()
+    logger.add(
+        sys.stdout,
+        level=get_settings().log_level,
+        format=LOG_FORMAT,
+        enqueue=True,
+    )
+    _configured = True
@@ -0,0 +1,18 @@
+"""
+Response classes shared across the API.
+"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    
+    Kept in-tree because FastAPI's own ORJSONResponse is deprecated in newer
+    releases. Handles datetimes natively and serializes UTC as "Z".
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
@@ -5,14 +5,20 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
-import sys
 
-from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.core.database import init_db, prewarm_db, close_db
+from app.core.responses import ORJSONResponse
+from app.core.http_clients import get_discord_client, close_http_clients
 from app.api.routes import router as api_router
 from app.api.discovery import router as discovery_router
 from app.api.filter_testing import router as filter_testing_router
-from app.services.poller import PollingScheduler
+from app.services.poller import PollingScheduler, JobPollingService
+from app.services.discord import DiscordNotifier
+
+settings = get_settings()
+configure_logging()
 
 
 # Global polling scheduler
@@ -25,30 +31,28 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting RushJob backend...")
     
-    # Configure logging
-    logger.remove()
-    logger.add(
-        sys.stdout,
-        level=settings.log_level,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-    )
-    
     # Initialize database
     try:
         await init_db()
         logger.info("Database initialized successfully")
+        await prewarm_db(settings.max_concurrent_polls)
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         logger.warning("App will start without database - some features may not work")
     
-    # Start background polling if not in debug mode
+    # Discord notifier on the shared outbound HTTP client (connection pool reused across requests)
+    app.state.discord = DiscordNotifier(client=get_discord_client())
+    
+    # Long-lived polling service shared by request handlers and background tasks
+    app.state.poller = JobPollingService()
+    
+    # Background polling runs in a separate worker process unless explicitly enabled here
     global polling_scheduler
-    # Temporarily disable background polling until DB is working
-    # if not settings.debug:
-    #     polling_scheduler = PollingScheduler()
-    #     import asyncio
-    #     asyncio.create_task(polling_scheduler.start_polling(settings.default_poll_interval_minutes))
-    #     logger.info("Background polling started")
+    if settings.run_poller_in_web:
+        polling_scheduler = PollingScheduler()
+        import asyncio
+        asyncio.create_task(polling_scheduler.start_polling(settings.default_poll_interval_minutes))
+        logger.info("Background polling started")
     
     yield
     
@@ -58,6 +62,8 @@ async def lifespan(app: FastAPI):
     if polling_scheduler:
         await polling_scheduler.stop_polling()
     
+    await app.state.poller.close()
+    await close_http_clients()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -67,7 +73,8 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Job alert system for ATS platforms like Greenhouse",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -95,17 +102,18 @@ async def root():
     }
 
 
-@app.get("/debug/env")
-async def debug_env():
-    """Debug endpoint to check environment variables (remove in production)."""
-    import os
-    return {
-        "has_database_url": bool(os.getenv("DATABASE_URL") or os.getenv("database_url")),
-        "has_supabase_url": bool(os.getenv("SUPABASE_URL") or os.getenv("supabase_url")),
-        "database_url_prefix": (os.getenv("DATABASE_URL") or os.getenv("database_url", ""))[:30] + "...",
-        "port": os.getenv("PORT"),
-        "debug_mode": settings.debug
-    }
+if settings.debug:
+    @app.get("/debug/env")
+    async def debug_env():
+        """Debug endpoint to check environment variables (debug mode only)."""
+        import os
+        return {
+            "has_database_url": bool(os.getenv("DATABASE_URL") or os.getenv("database_url")),
+            "has_supabase_url": bool(os.getenv("SUPABASE_URL") or os.getenv("supabase_url")),
+            "database_url_prefix": (os.getenv("DATABASE_URL") or os.getenv("database_url", ""))[:30] + "...",
+            "port": os.getenv("PORT"),
+            "debug_mode": settings.debug
+        }
 
 
 @app.get("/health")
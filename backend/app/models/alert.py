@@ -0,0 +1,87 @@
+"""
+User alert model.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, FrozenSet, Optional, Tuple
+from sqlalchemy import Boolean, DateTime, String, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import Base, StringArray
+
+if TYPE_CHECKING:
+    from app.models.notification import Notification
+
+
+class UserAlert(Base):
+    """User-configured job alerts."""
+    __tablename__ = "user_alerts"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)  # Supabase user ID
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    
+    # Filter criteria (text arrays, so the matcher can push filters into SQL)
+    company_slugs: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    title_keywords: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    title_exclude_keywords: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    departments: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    locations: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    job_types: Mapped[list[str]] = mapped_column(StringArray, default=list)
+    include_remote: Mapped[bool] = mapped_column(Boolean, default=True)
+    
+    # Notification settings
+    discord_webhook_url: Mapped[Optional[str]] = mapped_column(String(500))
+    email_address: Mapped[Optional[str]] = mapped_column(String(255))
+    notification_frequency: Mapped[str] = mapped_column(String(20), default="immediate")  # immediate, daily, weekly
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_notified_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    
+    # Relationships
+    notifications: Mapped[list["Notification"]] = relationship("Notification", back_populates="alert")
+    
+    # Indexes
+    __table_args__ = (
+        Index("idx_user_alerts_active", "user_id", "is_active"),
+        Index("idx_alerts_company_slugs_gin", "company_slugs", postgresql_using="gin"),
+        Index("idx_alerts_title_keywords_gin", "title_keywords", postgresql_using="gin"),
+        Index("idx_alerts_departments_gin", "departments", postgresql_using="gin"),
+        Index("idx_alerts_job_types_gin", "job_types", postgresql_using="gin"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<UserAlert {self.name} for user {self.user_id}>"
+    
+    def _memoized(self, key: str, value: Optional[list], build: Callable[[list], Any]) -> Any:
+        """Cache build(value) on the instance until the column is assigned a new list."""
+        cache = self.__dict__.setdefault("_memo", {})
+        entry = cache.get(key)
+        if entry is None or entry[0] is not value:
+            entry = cache[key] = (value, build(value or []))
+        return entry[1]
+    
+    # Lookup forms of the filter lists, for the matcher
+    @property
+    def company_slug_set(self) -> FrozenSet[str]:
+        return self._memoized("company_slugs", self.company_slugs, frozenset)
+    
+    @property
+    def department_set(self) -> FrozenSet[str]:
+        return self._memoized("departments", self.departments, frozenset)
+    
+    @property
+    def job_type_set(self) -> FrozenSet[str]:
+        return self._memoized("job_types", self.job_types, frozenset)
+    
+    @property
+    def title_keywords_lower(self) -> Tuple[str, ...]:
+        return self._memoized("title_keywords", self.title_keywords, lambda kws: tuple(kw.lower() for kw in kws))
+    
+    @property
+    def title_exclude_keywords_lower(self) -> Tuple[str, ...]:
+        return self._memoized(
+            "title_exclude_keywords", self.title_exclude_keywords, lambda kws: tuple(kw.lower() for kw in kws)
+        )
@@ -0,0 +1,25 @@
+"""
+Declarative base and shared column types for RushJob models.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import JSON, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import DeclarativeBase
+
+
+# Binary JSONB on Postgres (smaller, GIN-indexable); plain JSON elsewhere (SQLite dev/tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# Text arrays on Postgres so alert filters can be matched in SQL via GIN (&&, @>);
+# JSON lists on SQLite, which has no array type
+StringArray = ARRAY(String).with_variant(JSON(), "sqlite")
+
+
+def utcnow() -> datetime:
+    """Current time as an aware UTC datetime, for app-side column defaults."""
+    return datetime.now(timezone.utc)
+
+
+class Base(DeclarativeBase):
+    """Base class for all models."""
+    pass
@@ -0,0 +1,38 @@
+"""
+Company model.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Boolean, DateTime, String, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+if TYPE_CHECKING:
+    from app.models.job import Job
+
+
+class Company(Base):
+    """Companies that we monitor for job postings."""
+    __tablename__ = "companies"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    slug: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    ats_type: Mapped[str] = mapped_column(String(50), nullable=False)  # 'greenhouse', 'lever', etc
+    api_endpoint: Mapped[str] = mapped_column(String(500), nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    poll_interval_minutes: Mapped[int] = mapped_column(Integer, default=15)
+    last_polled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # Backoff state: polls with no new/updated jobs (or errors) in a row stretch the interval
+    next_poll_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    consecutive_empty_polls: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    jobs: Mapped[list["Job"]] = relationship("Job", back_populates="company")
+    
+    def __repr__(self) -> str:
+        return f"<Company {self.name} ({self.slug})>"
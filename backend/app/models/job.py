@@ -0,0 +1,68 @@
+"""
+Job model.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import (
+    Boolean, DateTime, String, LargeBinary,
+    ForeignKey, Index, UniqueConstraint, text
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import Base, JSONType, utcnow
+
+if TYPE_CHECKING:
+    from app.models.company import Company
+    from app.models.notification import Notification
+
+
+class Job(Base):
+    """Job postings we've discovered."""
+    __tablename__ = "jobs"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), nullable=False)
+    external_id: Mapped[str] = mapped_column(String(100), nullable=False)  # Greenhouse job ID
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    department: Mapped[Optional[str]] = mapped_column(String(100))
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    job_type: Mapped[Optional[str]] = mapped_column(String(50))  # full-time, part-time, contract, intern
+    external_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary(8), nullable=False)  # xxh3-64 digest for change detection
+    raw_data: Mapped[dict] = mapped_column(JSONType)  # Full API response
+    # Stamped app-side (one value per poll batch); server_default only covers rows inserted outside the app
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    
+    # Relationships
+    company: Mapped["Company"] = relationship("Company", back_populates="jobs")
+    notifications: Mapped[list["Notification"]] = relationship("Notification", back_populates="job")
+    
+    # Indexes for efficient querying
+    __table_args__ = (
+        # (company_id, external_id) lookups use the uq_company_job unique index
+        Index("idx_job_active_last_seen", "is_active", "last_seen_at"),
+        Index("idx_jobs_company_active_seen", "company_id", "is_active", "last_seen_at"),
+        # Partial index for location aggregation over active jobs only
+        Index(
+            "idx_jobs_active_location", "location",
+            postgresql_where=text("is_active = true AND location IS NOT NULL AND location <> ''")
+        ),
+        # Newest active jobs first (/jobs, /debug/jobs-simple); covering for the debug listing
+        Index(
+            "idx_jobs_active_recent", text("first_seen_at DESC"),
+            postgresql_include=["id", "title", "company_id", "location"],
+            postgresql_where=text("is_active = true")
+        ),
+        # Same ordering when /jobs is filtered by company
+        Index(
+            "idx_jobs_company_recent", "company_id", text("first_seen_at DESC"),
+            postgresql_where=text("is_active = true")
+        ),
+        UniqueConstraint("company_id", "external_id", name="uq_company_job"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<Job {self.title} at {self.company.name if self.company else 'Unknown'}>"
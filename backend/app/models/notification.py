@@ -0,0 +1,40 @@
+"""
+Notification model.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import DateTime, String, Text, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from app.models.alert import UserAlert
+    from app.models.job import Job
+
+
+class Notification(Base):
+    """Record of notifications sent to users."""
+    __tablename__ = "notifications"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    alert_id: Mapped[int] = mapped_column(ForeignKey("user_alerts.id"), nullable=False)
+    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"), nullable=False)
+    notification_type: Mapped[str] = mapped_column(String(20), nullable=False)  # discord, email
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # sent, failed, pending
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    
+    # Relationships
+    alert: Mapped["UserAlert"] = relationship("UserAlert", back_populates="notifications")
+    job: Mapped["Job"] = relationship("Job", back_populates="notifications")
+    
+    # Indexes
+    __table_args__ = (
+        Index("idx_notifications_alert_job", "alert_id", "job_id"),
+        Index("idx_notifications_status_sent", "status", "sent_at"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<Notification {self.notification_type} for alert {self.alert_id}>"
@@ -0,0 +1,41 @@
+"""
+Poll log model.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import DateTime, String, Text, Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from app.models.company import Company
+
+
+class PollLog(Base):
+    """Log of polling attempts for monitoring and debugging."""
+    __tablename__ = "poll_logs"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # success, error, timeout
+    jobs_found: Mapped[int] = mapped_column(Integer, default=0)
+    new_jobs: Mapped[int] = mapped_column(Integer, default=0)
+    updated_jobs: Mapped[int] = mapped_column(Integer, default=0)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    response_time_ms: Mapped[Optional[int]] = mapped_column(Integer)
+    
+    # Relationships
+    company: Mapped["Company"] = relationship("Company")
+    
+    # Indexes
+    __table_args__ = (
+        Index("idx_poll_logs_company_started", "company_id", "started_at"),
+        Index("idx_poll_logs_status", "status"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<PollLog for {self.company.name if self.company else 'Unknown'} at {self.started_at}>"
@@ -2,10 +2,13 @@
 Pydantic schemas for user alerts.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, HttpUrl
 
 
+NotificationFrequency = Literal["immediate", "daily", "weekly"]
+
+
 class UserAlertBase(BaseModel):
     """Base schema for user alerts."""
     name: str = Field(..., min_length=1, max_length=255, description="Alert name")
@@ -23,7 +26,7 @@ class UserAlertBase(BaseModel):
     # Notification settings
     discord_webhook_url: Optional[HttpUrl] = None
     email_address: Optional[str] = Field(None, max_length=255)
-    notification_frequency: str = Field("immediate", pattern="^(immediate|daily|weekly)$")
+    notification_frequency: NotificationFrequency = "immediate"
 
 
 class UserAlertCreate(UserAlertBase):
@@ -44,7 +47,7 @@ class UserAlertUpdate(UserAlertBase):
     include_remote: Optional[bool] = None
     discord_webhook_url: Optional[HttpUrl] = None
     email_address: Optional[str] = Field(None, max_length=255)
-    notification_frequency: Optional[str] = Field(None, pattern="^(immediate|daily|weekly)$")
+    notification_frequency: Optional[NotificationFrequency] = None
 
 
 class UserAlertResponse(UserAlertBase):
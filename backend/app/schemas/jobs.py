@@ -38,7 +38,7 @@ class JobResponse(JobBase):
     """Schema for job responses."""
     id: int
     company_id: int
-    content_hash: str
+    content_hash: bytes
     raw_data: Dict[str, Any]
     first_seen_at: datetime
     last_seen_at: datetime
@@ -48,4 +48,6 @@ class JobResponse(JobBase):
     company: Optional[Dict[str, Any]] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+        # Keep content_hash as a hex string in JSON output
+        ser_json_bytes = "hex"
\ No newline at end of file
@@ -1,19 +1,43 @@
 """
 Initialize services package.
+
+Service classes are re-exported lazily (PEP 562) so importing the package,
+or one service module, doesn't pull in every other service's dependencies.
 """
+import importlib
 
-from .matcher import JobMatcher
-from .location_matcher import LocationMatcher
-from .greenhouse import GreenhouseClient, GreenhouseJob
-from .discord import DiscordNotifier
-from .poller import JobPollingService, PollingScheduler
+_LAZY = {
+    'JobMatcher': ('app.services.matcher', 'JobMatcher'),
+    'AlertIndex': ('app.services.matcher', 'AlertIndex'),
+    'LocationMatcher': ('app.services.location_matcher', 'LocationMatcher'),
+    'GreenhouseClient': ('app.services.greenhouse', 'GreenhouseClient'),
+    'GreenhouseJob': ('app.services.greenhouse', 'GreenhouseJob'),
+    'DiscordNotifier': ('app.services.discord', 'DiscordNotifier'),
+    'JobPollingService': ('app.services.poller', 'JobPollingService'),
+    'PollingScheduler': ('app.services.poller', 'PollingScheduler'),
+}
 
 __all__ = [
     'JobMatcher',
-    'LocationMatcher', 
+    'AlertIndex',
+    'LocationMatcher',
     'GreenhouseClient',
     'GreenhouseJob',
     'DiscordNotifier',
     'JobPollingService',
     'PollingScheduler'
 ]
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -1,19 +1,120 @@
 """
 Discord webhook notification service.
 """
-from typing import List, Optional
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import httpx
+import orjson
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.models import Job, UserAlert
 
 
+# Maximum number of in-flight notification POSTs in send_job_notifications_batch
+NOTIFICATION_CONCURRENCY = 20
+
+# Attempts per webhook POST when Discord answers 429 or 5xx
+WEBHOOK_MAX_ATTEMPTS = 5
+
+# Upper bound of the random delay added to each retry
+WEBHOOK_RETRY_JITTER_SECONDS = 0.5
+
+# NotifierBatcher defaults: send once an alert has this many queued jobs, or
+# once its oldest queued job has waited this long
+BATCH_MAX_JOBS = 10
+BATCH_MAX_WAIT_SECONDS = 2.0
+
+# Adaptive limit on webhook POSTs per second across all webhooks: halved when
+# the smoothed share of 429s passes the threshold, grown again after a quiet period
+WEBHOOK_INITIAL_RATE = 30.0
+WEBHOOK_MIN_RATE = 1.0
+WEBHOOK_MAX_RATE = 50.0  # Discord's global per-client limit
+THROTTLE_EWMA_ALPHA = 0.1
+THROTTLE_SHARE_THRESHOLD = 0.05
+RATE_RECOVERY_SECONDS = 60.0
+RATE_RECOVERY_FACTOR = 1.1
+
+# Webhook bodies are pre-encoded with orjson and sent as raw content
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (webhook_url, jobs, alert, is_initial)
+NotificationItem = Tuple[str, List[Job], UserAlert, bool]
+
+
+class _AdaptiveRateLimiter:
+    """
+    Token bucket whose rate adapts to observed 429s (AIMD).
+    
+    The share of throttled responses is tracked as an EWMA. Once it passes
+    THROTTLE_SHARE_THRESHOLD the rate is halved, at most once per second so
+    one burst of 429s counts once. After RATE_RECOVERY_SECONDS without a 429
+    it grows by RATE_RECOVERY_FACTOR.
+    """
+    
+    __slots__ = ("rate", "_tokens", "_refilled_at", "_throttle_share", "_last_throttled_at", "_last_changed_at")
+    
+    def __init__(self, rate: float = WEBHOOK_INITIAL_RATE):
+        now = time.monotonic()
+        self.rate = rate
+        self._tokens = rate
+        self._refilled_at = now
+        self._throttle_share = 0.0
+        self._last_throttled_at = now
+        self._last_changed_at = now
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def record(self, throttled: bool) -> None:
+        """Feed back whether a response was a 429 and adjust the rate."""
+        now = time.monotonic()
+        self._throttle_share += THROTTLE_EWMA_ALPHA * (float(throttled) - self._throttle_share)
+        
+        if throttled:
+            self._last_throttled_at = now
+            if self._throttle_share > THROTTLE_SHARE_THRESHOLD and now - self._last_changed_at >= 1.0:
+                self.rate = max(WEBHOOK_MIN_RATE, self.rate / 2)
+                self._tokens = min(self._tokens, self.rate)
+                self._last_changed_at = now
+                logger.warning(f"Discord is throttling webhooks, lowering send rate to {self.rate:.1f}/s")
+        elif (self.rate < WEBHOOK_MAX_RATE
+              and now - self._last_throttled_at >= RATE_RECOVERY_SECONDS
+              and now - self._last_changed_at >= RATE_RECOVERY_SECONDS):
+            self.rate = min(WEBHOOK_MAX_RATE, self.rate * RATE_RECOVERY_FACTOR)
+            self._last_changed_at = now
+
+
 class DiscordNotifier:
     """Handles sending job notifications via Discord webhooks."""
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30)
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: Shared HTTP client to send with. It is left open on
+                close(); without one, the notifier owns a private client.
+        """
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+        )
+        # Webhook URL -> time.monotonic() until which Discord says its bucket is exhausted
+        self._blocked_until: Dict[str, float] = {}
+        # Paces POSTs across all webhooks, slowing down when 429s pile up
+        self._rate_limiter = _AdaptiveRateLimiter()
     
     async def send_job_notification(
         self, 
@@ -34,18 +135,90 @@ class DiscordNotifier:
         Returns:
             True if notification was sent successfully, False otherwise
         """
-        try:
-            embed = self._create_embed(jobs, alert, is_initial)
-            payload = {
-                "embeds": [embed],
-                "username": "RushJob",
-                "avatar_url": "https://cdn.discordapp.com/attachments/placeholder/rushjob-logo.png"
-            }
+        results = await self.send_job_notifications_batch([(webhook_url, jobs, alert, is_initial)])
+        return results[0]
+    
+    async def send_job_notifications_batch(self, items: List[NotificationItem]) -> List[bool]:
+        """
+        Send several job notifications concurrently.
+        
+        Payloads are built up front, then POSTed over the shared connection
+        pool with at most NOTIFICATION_CONCURRENCY requests in flight.
+        
+        Args:
+            items: (webhook_url, jobs, alert, is_initial) tuples
             
-            response = await self.client.post(webhook_url, json=payload)
+        Returns:
+            Whether each notification was sent successfully, in the same order as `items`
+        """
+        # One embed timestamp for the whole batch
+        timestamp = datetime.now(timezone.utc).isoformat()
+        payloads = []
+        for webhook_url, jobs, alert, is_initial in items:
+            try:
+                payloads.append(self._create_payload(jobs, alert, is_initial, timestamp))
+            except Exception as e:
+                logger.error(f"Unexpected error building Discord notification: {e}")
+                payloads.append(None)
+        
+        semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+        
+        async def send_with_limit(item: NotificationItem, payload: Optional[dict]) -> bool:
+            if payload is None:
+                return False
+            webhook_url, jobs, alert, _ = item
+            async with semaphore:
+                return await self._post_notification(webhook_url, payload, len(jobs), alert.name)
+        
+        results = await asyncio.gather(
+            *(send_with_limit(item, payload) for item, payload in zip(items, payloads)),
+            return_exceptions=True
+        )
+        return [result is True for result in results]
+    
+    def _create_payload(
+        self,
+        jobs: List[Job],
+        alert: UserAlert,
+        is_initial: bool,
+        timestamp: Optional[str] = None
+    ) -> dict:
+        """
+        Create the webhook request body for a job notification.
+        
+        Args:
+            jobs: List of jobs to include in notification
+            alert: User alert configuration
+            is_initial: Whether this is initial notification
+            timestamp: ISO 8601 embed timestamp (defaults to now)
+            
+        Returns:
+            Discord webhook payload dictionary
+        """
+        return {
+            "embeds": [self._create_embed(jobs, alert, is_initial, timestamp)],
+            "username": "RushJob",
+            "avatar_url": "https://cdn.discordapp.com/attachments/placeholder/rushjob-logo.png"
+        }
+    
+    async def _post_notification(self, webhook_url: str, payload: dict, job_count: int, alert_name: str) -> bool:
+        """
+        POST a prepared notification payload to a Discord webhook.
+        
+        Args:
+            webhook_url: Discord webhook URL
+            payload: Webhook request body
+            job_count: Number of jobs in the notification (for logging)
+            alert_name: Name of the alert being notified (for logging)
+            
+        Returns:
+            True if notification was sent successfully, False otherwise
+        """
+        try:
+            response = await self._post_with_retry(webhook_url, payload)
             response.raise_for_status()
             
-            logger.info(f"Successfully sent Discord notification for {len(jobs)} jobs to alert '{alert.name}'")
+            logger.info(f"Successfully sent Discord notification for {job_count} jobs to alert '{alert_name}'")
             return True
             
         except httpx.HTTPStatusError as e:
@@ -56,7 +229,80 @@ class DiscordNotifier:
             logger.error(f"Unexpected error sending Discord notification: {e}")
             return False
     
-    def _create_embed(self, jobs: List[Job], alert: UserAlert, is_initial: bool) -> dict:
+    async def _post_with_retry(self, webhook_url: str, payload: dict) -> httpx.Response:
+        """
+        POST to a Discord webhook, retrying rate limits (429) and server errors (5xx).
+        
+        Retries wait for the server's Retry-After when given, otherwise back off
+        exponentially; both get random jitter. Requests to a webhook whose rate
+        limit bucket is known to be exhausted wait for it to reset first, and
+        every attempt goes through the notifier-wide adaptive rate limiter.
+        
+        Args:
+            webhook_url: Discord webhook URL
+            payload: Webhook request body
+            
+        Returns:
+            The last response received (callers check its status)
+        """
+        # Encoded once and reused across retries
+        body = orjson.dumps(payload)
+        
+        for attempt in range(WEBHOOK_MAX_ATTEMPTS):
+            wait = self._blocked_until.get(webhook_url, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            await self._rate_limiter.acquire()
+            response = await self.client.post(webhook_url, content=body, headers=JSON_HEADERS)
+            self._rate_limiter.record(response.status_code == 429)
+            retry_after = self._update_rate_limit(webhook_url, response)
+            
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if attempt == WEBHOOK_MAX_ATTEMPTS - 1:
+                break
+            
+            delay = (retry_after if retry_after is not None else 2 ** attempt) + random.uniform(0, WEBHOOK_RETRY_JITTER_SECONDS)
+            logger.warning(f"Discord webhook returned {response.status_code}, retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{WEBHOOK_MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+        
+        return response
+    
+    def _update_rate_limit(self, webhook_url: str, response: httpx.Response) -> Optional[float]:
+        """
+        Record a webhook's rate limit state from Discord's response headers.
+        
+        Args:
+            webhook_url: Discord webhook URL the response came from
+            response: Webhook response
+            
+        Returns:
+            Seconds until the bucket resets if the request was rate limited, else None
+        """
+        headers = response.headers
+        if response.status_code == 429:
+            reset_after = _parse_seconds(headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After"))
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            reset_after = _parse_seconds(headers.get("X-RateLimit-Reset-After"))
+        else:
+            reset_after = None
+        
+        if reset_after is None:
+            self._blocked_until.pop(webhook_url, None)
+        else:
+            self._blocked_until[webhook_url] = time.monotonic() + reset_after
+        
+        return reset_after if response.status_code == 429 else None
+    
+    def _create_embed(
+        self,
+        jobs: List[Job],
+        alert: UserAlert,
+        is_initial: bool,
+        timestamp: Optional[str] = None
+    ) -> dict:
         """
         Create Discord embed for job notification.
         
@@ -64,6 +310,7 @@ class DiscordNotifier:
             jobs: List of jobs to include in notification
             alert: User alert configuration
             is_initial: Whether this is initial notification
+            timestamp: ISO 8601 embed timestamp (defaults to now)
             
         Returns:
             Discord embed dictionary
@@ -86,7 +333,7 @@ class DiscordNotifier:
             "title": title,
             "description": description,
             "color": color,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
             "footer": {
                 "text": "RushJob • Job Alert System"
             },
@@ -94,10 +341,7 @@ class DiscordNotifier:
         }
         
         # Add job fields (limit to 10 jobs to avoid Discord limits)
-        jobs_to_show = jobs[:10]
-        for job in jobs_to_show:
-            job_field = self._create_job_field(job)
-            embed["fields"].append(job_field)
+        embed["fields"] = [self._create_job_field(job) for job in jobs[:10]]
         
         # Add "and X more" field if there are more jobs
         if len(jobs) > 10:
@@ -127,29 +371,22 @@ class DiscordNotifier:
         Returns:
             Discord embed field dictionary
         """
-        # Create job title with company
-        title = f"**{job.title}**"
-        
-        # Create job details
-        details = []
-        details.append(f"🏢 {job.company.name}")
-        
-        if job.department:
-            details.append(f"📁 {job.department}")
-        
-        if job.location:
-            location_emoji = "🌍" if "remote" in job.location.lower() else "📍"
-            details.append(f"{location_emoji} {job.location}")
-        
-        if job.job_type:
-            details.append(f"💼 {job.job_type}")
+        department = job.department
+        location = job.location
+        job_type = job.job_type
         
-        # Add apply link
-        details.append(f"[**Apply Here**]({job.external_url})")
+        # Build the value in one expression rather than joining a list of lines
+        value = (
+            f"🏢 {job.company.name}"
+            + (f"\n📁 {department}" if department else "")
+            + (f"\n{'🌍' if 'remote' in location.lower() else '📍'} {location}" if location else "")
+            + (f"\n💼 {job_type}" if job_type else "")
+            + f"\n[**Apply Here**]({job.external_url})"
+        )
         
         return {
-            "name": title,
-            "value": "\n".join(details),
+            "name": f"**{job.title}**",
+            "value": value,
             "inline": True
         }
     
@@ -163,47 +400,15 @@ class DiscordNotifier:
         Returns:
             Formatted string describing the alert criteria
         """
-        criteria = []
-        
-        if alert.company_slugs:
-            if len(alert.company_slugs) <= 3:
-                companies = ", ".join(alert.company_slugs)
-                criteria.append(f"**Companies:** {companies}")
-            else:
-                criteria.append(f"**Companies:** {len(alert.company_slugs)} selected")
-        
-        if alert.title_keywords:
-            keywords = ", ".join(alert.title_keywords[:5])
-            if len(alert.title_keywords) > 5:
-                keywords += f" (+{len(alert.title_keywords) - 5} more)"
-            criteria.append(f"**Keywords:** {keywords}")
-        
-        if alert.title_exclude_keywords:
-            exclude = ", ".join(alert.title_exclude_keywords[:3])
-            if len(alert.title_exclude_keywords) > 3:
-                exclude += f" (+{len(alert.title_exclude_keywords) - 3} more)"
-            criteria.append(f"**Excluding:** {exclude}")
-        
-        if alert.departments:
-            depts = ", ".join(alert.departments[:3])
-            if len(alert.departments) > 3:
-                depts += f" (+{len(alert.departments) - 3} more)"
-            criteria.append(f"**Departments:** {depts}")
-        
-        if alert.locations:
-            locs = ", ".join(alert.locations[:3])
-            if len(alert.locations) > 3:
-                locs += f" (+{len(alert.locations) - 3} more)"
-            criteria.append(f"**Locations:** {locs}")
-        
-        if alert.job_types:
-            types = ", ".join(alert.job_types)
-            criteria.append(f"**Types:** {types}")
-        
-        remote_text = "Yes" if alert.include_remote else "No"
-        criteria.append(f"**Remote Jobs:** {remote_text}")
-        
-        return "\n".join(criteria) if criteria else "No specific criteria"
+        return _render_alert_summary(
+            tuple(alert.company_slugs or ()),
+            tuple(alert.title_keywords or ()),
+            tuple(alert.title_exclude_keywords or ()),
+            tuple(alert.departments or ()),
+            tuple(alert.locations or ()),
+            tuple(alert.job_types or ()),
+            alert.include_remote,
+        )
     
     async def test_webhook(self, webhook_url: str) -> bool:
         """
@@ -223,11 +428,13 @@ class DiscordNotifier:
                     "title": "Webhook Test",
                     "description": "This is a test message to verify your Discord webhook is working correctly.",
                     "color": 0x5865F2,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat()
                 }]
             }
             
-            response = await self.client.post(webhook_url, json=payload)
+            # One attempt only: validation should fail fast rather than retry a bad URL
+            response = await self.client.post(webhook_url, content=orjson.dumps(payload), headers=JSON_HEADERS)
+            self._update_rate_limit(webhook_url, response)
             response.raise_for_status()
             
             logger.info("Discord webhook test successful")
@@ -238,5 +445,185 @@ class DiscordNotifier:
             return False
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
\ No newline at end of file
+        """Close the HTTP client if this notifier owns it."""
+        if self._owns_client:
+            await self.client.aclose()
+
+
+@lru_cache(maxsize=1024)
+def _render_alert_summary(
+    company_slugs: Tuple[str, ...],
+    title_keywords: Tuple[str, ...],
+    title_exclude_keywords: Tuple[str, ...],
+    departments: Tuple[str, ...],
+    locations: Tuple[str, ...],
+    job_types: Tuple[str, ...],
+    include_remote: bool
+) -> str:
+    """
+    Render the alert-criteria embed text.
+    
+    Cached on the criteria themselves, so alerts with identical filters (and
+    repeat notifications for one alert) share the rendered string, and an
+    edited alert naturally misses the cache.
+    """
+    criteria = []
+    
+    if company_slugs:
+        if len(company_slugs) <= 3:
+            companies = ", ".join(company_slugs)
+            criteria.append(f"**Companies:** {companies}")
+        else:
+            criteria.append(f"**Companies:** {len(company_slugs)} selected")
+    
+    if title_keywords:
+        keywords = ", ".join(title_keywords[:5])
+        if len(title_keywords) > 5:
+            keywords += f" (+{len(title_keywords) - 5} more)"
+        criteria.append(f"**Keywords:** {keywords}")
+    
+    if title_exclude_keywords:
+        exclude = ", ".join(title_exclude_keywords[:3])
+        if len(title_exclude_keywords) > 3:
+            exclude += f" (+{len(title_exclude_keywords) - 3} more)"
+        criteria.append(f"**Excluding:** {exclude}")
+    
+    if departments:
+        depts = ", ".join(departments[:3])
+        if len(departments) > 3:
+            depts += f" (+{len(departments) - 3} more)"
+        criteria.append(f"**Departments:** {depts}")
+    
+    if locations:
+        locs = ", ".join(locations[:3])
+        if len(locations) > 3:
+            locs += f" (+{len(locations) - 3} more)"
+        criteria.append(f"**Locations:** {locs}")
+    
+    if job_types:
+        types = ", ".join(job_types)
+        criteria.append(f"**Types:** {types}")
+    
+    remote_text = "Yes" if include_remote else "No"
+    criteria.append(f"**Remote Jobs:** {remote_text}")
+    
+    return "\n".join(criteria) if criteria else "No specific criteria"
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a rate limit header given in (possibly fractional) seconds."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+class _PendingBatch:
+    """Jobs queued for one (webhook, alert) pair."""
+    
+    __slots__ = ("alert", "opened_at", "entries")
+    
+    def __init__(self, alert: UserAlert):
+        self.alert = alert
+        self.opened_at = time.monotonic()
+        self.entries: List[Tuple[Job, asyncio.Future]] = []
+
+
+class NotifierBatcher:
+    """
+    Coalesces job notifications per (webhook, alert) into single webhook messages.
+    
+    Jobs queued for the same alert are sent together once max_jobs are waiting
+    or the oldest has waited max_wait seconds, whichever comes first.
+    """
+    
+    def __init__(
+        self,
+        notifier: DiscordNotifier,
+        max_jobs: int = BATCH_MAX_JOBS,
+        max_wait: float = BATCH_MAX_WAIT_SECONDS
+    ):
+        self.notifier = notifier
+        self.max_jobs = max_jobs
+        self.max_wait = max_wait
+        self._batches: Dict[Tuple[str, int], _PendingBatch] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, webhook_url: str, alert: UserAlert, job: Job) -> asyncio.Future:
+        """
+        Queue a job notification for an alert.
+        
+        Args:
+            webhook_url: Discord webhook URL
+            alert: Alert the job matched
+            job: Job to notify about
+            
+        Returns:
+            Future resolving to whether the batch containing the job was sent
+        """
+        key = (webhook_url, alert.id)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _PendingBatch(alert)
+        
+        future = asyncio.get_running_loop().create_future()
+        batch.entries.append((job, future))
+        
+        if len(batch.entries) >= self.max_jobs:
+            self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain_loop())
+        
+        return future
+    
+    async def flush(self) -> None:
+        """Send everything queued so far without waiting out the batch window."""
+        await self._flush(list(self._batches))
+    
+    async def drain(self) -> None:
+        """Send everything still queued right away (e.g. on shutdown)."""
+        await self._flush(list(self._batches))
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+    
+    async def _drain_loop(self) -> None:
+        """Flush batches as they fill up or time out; exits once nothing is queued."""
+        while self._batches:
+            oldest = min(batch.opened_at for batch in self._batches.values())
+            timeout = max(oldest + self.max_wait - time.monotonic(), 0.0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            now = time.monotonic()
+            await self._flush([
+                key for key, batch in self._batches.items()
+                if len(batch.entries) >= self.max_jobs or now - batch.opened_at >= self.max_wait
+            ])
+    
+    async def _flush(self, keys: List[Tuple[str, int]]) -> None:
+        """Send the given batches and resolve their futures."""
+        batches = [(key, self._batches.pop(key)) for key in keys if key in self._batches]
+        if not batches:
+            return
+        
+        items = [
+            (webhook_url, [job for job, _ in batch.entries], batch.alert, False)
+            for (webhook_url, _), batch in batches
+        ]
+        try:
+            results = await self.notifier.send_job_notifications_batch(items)
+        except Exception as e:
+            logger.error(f"Unexpected error sending batched Discord notifications: {e}")
+            results = [False] * len(batches)
+        
+        for (_, batch), success in zip(batches, results):
+            for _, future in batch.entries:
+                if not future.done():
+                    future.set_result(success)
@@ -1,18 +1,70 @@
 """
 Greenhouse API client for fetching job postings.
 """
-import hashlib
+import asyncio
+import re
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import httpx
+import orjson
+import xxhash
 from loguru import logger
 from app.core.config import settings
 
 
+# Maximum number of in-flight board requests in fetch_jobs_many
+FETCH_CONCURRENCY = 50
+
+# Boards with more jobs than this are turned into GreenhouseJobs in a worker
+# thread, so one large board doesn't stall the other in-flight fetches
+THREADED_PARSE_MIN_JOBS = 50
+
+# Job-type keywords guessed from titles, in priority order (first match wins)
+_JOB_TYPE_KEYWORDS = (
+    ("intern", "Intern"),
+    ("contract", "Contract"),
+    ("part-time", "Part-time"),
+    ("part time", "Part-time"),
+)
+_JOB_TYPE_RE = re.compile("|".join(re.escape(keyword) for keyword, _ in _JOB_TYPE_KEYWORDS))
+
+# Country-prefixed locations like "US-NYC" or "CA-Toronto" (exactly one hyphen)
+_LOCATION_PREFIX_RE = re.compile(r"(?:US|CA|UK|DE|FR|AU)-([^-]*)", re.IGNORECASE)
+
+# Case-insensitive "remote" check without lowercasing a copy of the string
+_REMOTE_RE = re.compile("remote", re.IGNORECASE)
+
+
+def _guess_job_type(title: str) -> str:
+    """Guess a job type from its title with one regex pass, defaulting to Full-time."""
+    found = set(_JOB_TYPE_RE.findall(title.lower()))
+    for keyword, job_type in _JOB_TYPE_KEYWORDS:
+        if keyword in found:
+            return job_type
+    return "Full-time"
+
+
+def compute_content_hash(title: str, location: str, department: str, job_type: str) -> bytes:
+    """
+    Hash the job fields that define a change.
+    
+    xxh3 is a fast non-cryptographic hash; the digest is only compared for
+    equality against the job's previous value.
+    """
+    return xxhash.xxh3_64_digest(f"{title}|{location}|{department}|{job_type}".encode())
+
+
 class GreenhouseJob:
     """Represents a job from Greenhouse API."""
     
+    # No per-instance __dict__: a poll cycle holds one of these per listed job
+    __slots__ = (
+        "raw_data", "id", "title", "location", "department", "absolute_url", "job_type", "_content_hash"
+    )
+    
     def __init__(self, data: Dict[str, Any]):
+        self._content_hash: Optional[bytes] = None
         self.raw_data = data
         self.id = str(data.get("id", ""))
         self.title = data.get("title", "")
@@ -31,15 +83,14 @@ class GreenhouseJob:
             return ""
         
         # Basic remote detection without LocationMatcher during init
-        if "remote" in name.lower():
+        if _REMOTE_RE.search(name):
             return "Remote"
         
         # Clean up common location format issues
         # Handle patterns like "US-NYC", "CA-Toronto", etc.
-        if "-" in name and len(name.split("-")) == 2:
-            prefix, location = name.split("-", 1)
-            if prefix.upper() in ["US", "CA", "UK", "DE", "FR", "AU"]:
-                return location.strip()
+        match = _LOCATION_PREFIX_RE.fullmatch(name)
+        if match:
+            return match.group(1).strip()
         
         return name.strip()
     
@@ -53,39 +104,34 @@ class GreenhouseJob:
         """Extract job type from metadata."""
         if not metadata:
             # Fallback: guess from title if no metadata
-            title_lower = self.title.lower()
-            if "intern" in title_lower:
-                return "Intern"
-            elif "contract" in title_lower:
-                return "Contract"
-            elif "part-time" in title_lower or "part time" in title_lower:
-                return "Part-time"
-            else:
-                return "Full-time"
+            return _guess_job_type(self.title)
         
         for item in metadata:
             if item and item.get("name", "").lower() in ["employment_type", "job_type"]:
                 return item.get("value", "")
         
         # Fallback: guess from title
-        title_lower = self.title.lower()
-        if "intern" in title_lower:
-            return "Intern"
-        elif "contract" in title_lower:
-            return "Contract"
-        elif "part-time" in title_lower or "part time" in title_lower:
-            return "Part-time"
-        else:
-            return "Full-time"
+        return _guess_job_type(self.title)
     
-    def content_hash(self) -> str:
-        """Generate hash for change detection."""
-        content = f"{self.title}|{self.location}|{self.department}|{self.job_type}"
-        return hashlib.sha256(content.encode()).hexdigest()
+    def content_hash(self) -> bytes:
+        """Generate hash for change detection (computed once per instance)."""
+        if self._content_hash is None:
+            self._content_hash = compute_content_hash(self.title, self.location, self.department, self.job_type)
+        return self._content_hash
+    
+    def content_key(self) -> int:
+        """64-bit key of this job's ID and content hash, for in-memory seen sets."""
+        # content_hash() is a fixed 8 bytes, so the concatenation is unambiguous
+        return xxhash.xxh3_64_intdigest(self.id.encode() + self.content_hash())
     
     def is_remote(self) -> bool:
         """Check if job is remote using basic detection."""
-        return "remote" in self.location.lower()
+        return _REMOTE_RE.search(self.location) is not None
+
+
+def _build_jobs(jobs_data: List[Dict[str, Any]]) -> List[GreenhouseJob]:
+    """Build GreenhouseJob objects from a board's raw job dicts."""
+    return [GreenhouseJob(job_data) for job_data in jobs_data]
 
 
 class GreenhouseClient:
@@ -98,16 +144,23 @@ class GreenhouseClient:
             "User-Agent": "RushJob/1.0",
             "Accept": "application/json",
         }
+        # HTTP/2 multiplexes concurrent board requests over the single Greenhouse host
         self.client = httpx.AsyncClient(
+            http2=True,
             timeout=settings.request_timeout_seconds,
-            limits=httpx.Limits(max_connections=settings.max_concurrent_polls),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
             headers=headers
         )
+        # Validators and parsed jobs from the last 200 per slug, for conditional GETs
+        self._etag_cache: Dict[str, Tuple[Dict[str, str], List[GreenhouseJob]]] = {}
     
     async def fetch_jobs(self, company_slug: str) -> List[GreenhouseJob]:
         """
         Fetch all jobs for a company from Greenhouse API.
         
+        Sends If-None-Match/If-Modified-Since when the board was fetched
+        before; on 304 Not Modified the previously parsed jobs are returned.
+        
         Args:
             company_slug: Company identifier (e.g., 'stripe', 'airbnb')
             
@@ -122,10 +175,22 @@ class GreenhouseClient:
         
         try:
             logger.info(f"Fetching jobs for {company_slug} from {url}")
-            response = await self.client.get(url)
-            response.raise_for_status()
+            cached = self._etag_cache.get(company_slug)
+            request = self.client.build_request("GET", url, headers=cached[0] if cached else None)
+            
+            # Streamed so the body is only downloaded once the status says it's worth parsing
+            response = await self.client.send(request, stream=True)
+            try:
+                if response.status_code == 304 and cached:
+                    logger.info(f"Jobs for {company_slug} not modified, reusing {len(cached[1])} cached jobs")
+                    return cached[1]
+                
+                response.raise_for_status()
+                content = await response.aread()
+            finally:
+                await response.aclose()
             
-            data = response.json()
+            data = orjson.loads(content)
             jobs_data = data.get("jobs", [])
             
             # Debug logging for problematic companies
@@ -135,11 +200,15 @@ class GreenhouseClient:
             
             if not jobs_data:
                 logger.warning(f"No jobs found for {company_slug}. Response data: {data}")
-                return []
-            
-            jobs = [GreenhouseJob(job_data) for job_data in jobs_data]
-            logger.info(f"Found {len(jobs)} jobs for {company_slug}")
+                jobs = []
+            else:
+                if len(jobs_data) > THREADED_PARSE_MIN_JOBS:
+                    jobs = await asyncio.to_thread(_build_jobs, jobs_data)
+                else:
+                    jobs = _build_jobs(jobs_data)
+                logger.info(f"Found {len(jobs)} jobs for {company_slug}")
             
+            self._remember_validators(company_slug, response, jobs)
             return jobs
             
         except httpx.HTTPStatusError as e:
@@ -154,6 +223,71 @@ class GreenhouseClient:
             logger.error(f"Unexpected error fetching jobs for {company_slug}: {e}")
             raise
     
+    def _remember_validators(
+        self,
+        company_slug: str,
+        response: httpx.Response,
+        jobs: List[GreenhouseJob]
+    ) -> None:
+        """Cache the response's ETag/Last-Modified and its jobs for the next conditional GET."""
+        validators = {}
+        if etag := response.headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+        
+        if validators:
+            self._etag_cache[company_slug] = (validators, jobs)
+        else:
+            self._etag_cache.pop(company_slug, None)
+    
+    async def fetch_jobs_many(
+        self,
+        company_slugs: List[str]
+    ) -> Tuple[Dict[str, List[GreenhouseJob]], Dict[str, Exception], Dict[str, float]]:
+        """
+        Fetch jobs for several companies concurrently.
+        
+        Args:
+            company_slugs: Company identifiers to fetch
+            
+        Returns:
+            Tuple of (jobs by slug for successful fetches, exception by slug for failed ones,
+            request duration in seconds by slug, not counting time queued for a slot)
+        """
+        if not company_slugs:
+            return {}, {}, {}
+        
+        semaphore = asyncio.Semaphore(min(FETCH_CONCURRENCY, len(company_slugs)))
+        durations = {}
+        
+        async def fetch_with_limit(company_slug: str) -> List[GreenhouseJob]:
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    return await self.fetch_jobs(company_slug)
+                finally:
+                    durations[company_slug] = time.monotonic() - start
+        
+        results = await asyncio.gather(
+            *(fetch_with_limit(slug) for slug in company_slugs),
+            return_exceptions=True
+        )
+        
+        jobs_by_slug = {}
+        errors = {}
+        for slug, result in zip(company_slugs, results):
+            if isinstance(result, Exception):
+                errors[slug] = result
+            else:
+                jobs_by_slug[slug] = result
+        
+        if errors:
+            logger.warning(f"Failed to fetch jobs for {len(errors)}/{len(company_slugs)} companies: "
+                           f"{', '.join(sorted(errors))}")
+        
+        return jobs_by_slug, errors, durations
+    
     async def test_company_endpoint(self, company_slug: str) -> bool:
         """
         Test if a company has a valid Greenhouse endpoint.
@@ -165,8 +299,14 @@ class GreenhouseClient:
             True if endpoint is valid and accessible, False otherwise
         """
         try:
-            jobs = await self.fetch_jobs(company_slug)
-            return True
+            # HEAD avoids downloading and parsing the whole board
+            response = await self.client.head(f"{self.base_url}/{company_slug}/jobs")
+            if response.status_code == 405:
+                # Fall back to a full fetch if HEAD isn't allowed
+                await self.fetch_jobs(company_slug)
+                return True
+            # Other HTTP errors might be temporary, so only a 404 counts as invalid
+            return response.status_code != 404
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return False
@@ -182,52 +322,57 @@ class GreenhouseClient:
 
 # Predefined list of companies with verified Greenhouse endpoints
 # Updated based on comprehensive testing - January 2025
-VERIFIED_GREENHOUSE_COMPANIES = [
+# (name, slug) pairs
+VERIFIED_GREENHOUSE_COMPANIES: Tuple[Tuple[str, str], ...] = (
     # Original verified companies (high job counts)
-    {"name": "Stripe", "slug": "stripe"},              # Confirmed working
-    {"name": "Airbnb", "slug": "airbnb"},              # Confirmed working
-    {"name": "Robinhood", "slug": "robinhood"},        # Confirmed working
-    {"name": "Peloton", "slug": "peloton"},            # Confirmed working
-    {"name": "Dropbox", "slug": "dropbox"},            # Confirmed working
-    {"name": "Coinbase", "slug": "coinbase"},          # Confirmed working
-    {"name": "Reddit", "slug": "reddit"},              # Confirmed working
-    {"name": "Lyft", "slug": "lyft"},                  # Confirmed working
-    {"name": "DoorDash", "slug": "doordashusa"},       # Confirmed working (fixed slug)
-    {"name": "Pinterest", "slug": "pinterest"},        # Confirmed working
-    {"name": "Databricks", "slug": "databricks"},      # Confirmed working
-    {"name": "Figma", "slug": "figma"},                # Confirmed working
-    {"name": "Discord", "slug": "discord"},            # Confirmed working
-    {"name": "Twitch", "slug": "twitch"},              # Confirmed working
+    ("Stripe", "stripe"),             # Confirmed working
+    ("Airbnb", "airbnb"),             # Confirmed working
+    ("Robinhood", "robinhood"),       # Confirmed working
+    ("Peloton", "peloton"),           # Confirmed working
+    ("Dropbox", "dropbox"),           # Confirmed working
+    ("Coinbase", "coinbase"),         # Confirmed working
+    ("Reddit", "reddit"),             # Confirmed working
+    ("Lyft", "lyft"),                 # Confirmed working
+    ("DoorDash", "doordashusa"),      # Confirmed working (fixed slug)
+    ("Pinterest", "pinterest"),       # Confirmed working
+    ("Databricks", "databricks"),     # Confirmed working
+    ("Figma", "figma"),               # Confirmed working
+    ("Discord", "discord"),           # Confirmed working
+    ("Twitch", "twitch"),             # Confirmed working
     
     # High-value additional companies (discovered via testing)
-    {"name": "Brex", "slug": "brex"},                  # 146 jobs
-    {"name": "Instacart", "slug": "instacart"},        # 121 jobs
-    {"name": "Asana", "slug": "asana"},                # 95 jobs
-    {"name": "Flexport", "slug": "flexport"},          # 75 jobs
-    {"name": "Gusto", "slug": "gusto"},                # 69 jobs
-    {"name": "Checkr", "slug": "checkr"},              # 63 jobs
-    {"name": "Amplitude", "slug": "amplitude"},        # 48 jobs
-    {"name": "Airtable", "slug": "airtable"},          # 47 jobs
-    {"name": "Mixpanel", "slug": "mixpanel"},          # 45 jobs
-    {"name": "Nextdoor", "slug": "nextdoor"},          # 36 jobs
-    {"name": "Thumbtack", "slug": "thumbtack"},        # 27 jobs
+    ("Brex", "brex"),                 # 146 jobs
+    ("Instacart", "instacart"),       # 121 jobs
+    ("Asana", "asana"),               # 95 jobs
+    ("Flexport", "flexport"),         # 75 jobs
+    ("Gusto", "gusto"),               # 69 jobs
+    ("Checkr", "checkr"),             # 63 jobs
+    ("Amplitude", "amplitude"),       # 48 jobs
+    ("Airtable", "airtable"),         # 47 jobs
+    ("Mixpanel", "mixpanel"),         # 45 jobs
+    ("Nextdoor", "nextdoor"),         # 36 jobs
+    ("Thumbtack", "thumbtack"),       # 27 jobs
     
     # Newly discovered high-value companies (January 2025)
-    {"name": "TripAdvisor", "slug": "tripadvisor"},    # 148 jobs
-    {"name": "Bird", "slug": "bird"},                  # 101 jobs
-    {"name": "Chime", "slug": "chime"},                # 53 jobs
-    {"name": "Kayak", "slug": "kayak"},                # 52 jobs
-    {"name": "Mercury", "slug": "mercury"},            # 45 jobs
-    {"name": "Industrious", "slug": "industrious"},    # 42 jobs
-    {"name": "Strava", "slug": "strava"},              # 26 jobs
+    ("TripAdvisor", "tripadvisor"),   # 148 jobs
+    ("Bird", "bird"),                 # 101 jobs
+    ("Chime", "chime"),               # 53 jobs
+    ("Kayak", "kayak"),               # 52 jobs
+    ("Mercury", "mercury"),           # 45 jobs
+    ("Industrious", "industrious"),   # 42 jobs
+    ("Strava", "strava"),             # 26 jobs
     
     # Companies that may need verification or have been problematic
-    # {"name": "Notion", "slug": "notion"},            # May have moved to AshbyHQ
-    # {"name": "Roblox", "slug": "roblox"},            # May use enterprise ATS
-    # {"name": "Epic Games", "slug": "epicgames"},     # May use custom ATS
+    # ("Notion", "notion"),           # May have moved to AshbyHQ
+    # ("Roblox", "roblox"),           # May use enterprise ATS
+    # ("Epic Games", "epicgames"),    # May use custom ATS
     
     # Companies confirmed NOT to use Greenhouse (remove these)
-    # {"name": "Canva", "slug": "canva"},              # Uses SmartRecruiters
-    # {"name": "Shopify", "slug": "shopify"},          # Uses custom ATS
-    # {"name": "Snowflake", "slug": "snowflake"},      # Uses AshbyHQ
-]
\ No newline at end of file
+    # ("Canva", "canva"),             # Uses SmartRecruiters
+    # ("Shopify", "shopify"),         # Uses custom ATS
+    # ("Snowflake", "snowflake"),     # Uses AshbyHQ
+)
+
+# Lookup structures derived from the tuple above
+VERIFIED_COMPANY_NAMES: Dict[str, str] = {slug: name for name, slug in VERIFIED_GREENHOUSE_COMPANIES}
+VERIFIED_GREENHOUSE_SLUGS: frozenset[str] = frozenset(VERIFIED_COMPANY_NAMES)
@@ -1,110 +1,185 @@
 """
 Enhanced location matching service for job filtering.
 """
-from typing import List, Dict, Set
+import heapq
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
 import re
 from loguru import logger
 
 
+# Country prefixes and HQ suffixes stripped from locations before splitting
+# (one alternation: the anchored branches can't overlap, so one pass does both)
+_AFFIX_RE = re.compile(r'^(?:us-|ca-|uk-)|\s+(?:hq|headquarters)$')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s,;/-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Separators tried in priority order; a location is split on the first one present
+_SEPARATORS = (',', ';', ' and ', ' or ', '/')
+
+# Parts dropped from normalized locations
+_NOISE_WORDS = frozenset({'and', 'or', 'the', 'area', 'metro', 'region', 'greater'})
+
+
+REMOTE_INDICATORS = (
+    'remote', 'work from home', 'wfh', 'telecommute', 'distributed',
+    'anywhere', 'virtual', 'home-based', 'home based'
+)
+
+# All indicators as one case-insensitive alternation: a single scan, no lowercased copy
+_REMOTE_RE = re.compile('|'.join(re.escape(indicator) for indicator in REMOTE_INDICATORS), re.IGNORECASE)
+
+
+# Canonical location -> aliases that resolve to it
+LOCATION_MAPPINGS: Dict[str, Tuple[str, ...]] = {
+    # US Cities and States
+    'chicago': ('chicago', 'chi', 'illinois', 'il'),
+    'new york': ('new york', 'nyc', 'ny', 'new york city', 'manhattan'),
+    'san francisco': ('san francisco', 'sf', 'ssf', 'south san francisco'),
+    'seattle': ('seattle', 'sea', 'washington', 'wa'),
+    'atlanta': ('atlanta', 'atl', 'georgia', 'ga'),
+    'boston': ('boston', 'massachusetts', 'ma'),
+    'texas': ('texas', 'tx', 'dallas', 'austin', 'houston'),
+    'california': ('california', 'ca', 'calif'),
+    'los angeles': ('los angeles', 'la', 'los angeles county'),
+    'denver': ('denver', 'colorado', 'co'),
+    'phoenix': ('phoenix', 'arizona', 'az'),
+    'portland': ('portland', 'oregon', 'or'),
+    'miami': ('miami', 'florida', 'fl'),
+    'philadelphia': ('philadelphia', 'philly', 'pennsylvania', 'pa'),
+    'detroit': ('detroit', 'michigan', 'mi'),
+    'las vegas': ('las vegas', 'vegas', 'nevada', 'nv'),
+    'salt lake city': ('salt lake city', 'slc', 'utah', 'ut'),
+    'minneapolis': ('minneapolis', 'minnesota', 'mn'),
+    'nashville': ('nashville', 'tennessee', 'tn'),
+    'raleigh': ('raleigh', 'north carolina', 'nc'),
+    'charlotte': ('charlotte', 'north carolina', 'nc'),
+    'richmond': ('richmond', 'virginia', 'va'),
+    'pittsburgh': ('pittsburgh', 'pennsylvania', 'pa'),
+    
+    # US Regions/Remote
+    'remote': ('remote', 'us-remote', 'us remote', 'remote us', 'remote in us', 
+              'remote in the us', 'work from home', 'wfh', 'telecommute', 
+              'distributed', 'anywhere'),
+    'us': ('us', 'usa', 'united states', 'america', 'amer', 'national us'),
+    'canada': ('canada', 'ca', 'toronto', 'ca-remote', 'can-remote', 
+              'ca-toronto', 'vancouver', 'montreal', 'ottawa', 'calgary'),
+    
+    # International - Europe
+    'london': ('london', 'uk', 'united kingdom', 'england', 'great britain'),
+    'dublin': ('dublin', 'ireland', 'dublin hq'),
+    'berlin': ('berlin', 'germany', 'de-berlin', 'deutschland'),
+    'paris': ('paris', 'france'),
+    'madrid': ('madrid', 'spain'),
+    'barcelona': ('barcelona', 'spain'),
+    'bucharest': ('bucharest', 'romania'),
+    'amsterdam': ('amsterdam', 'netherlands', 'holland'),
+    'zurich': ('zurich', 'switzerland'),
+    'stockholm': ('stockholm', 'sweden'),
+    'oslo': ('oslo', 'norway'),
+    'copenhagen': ('copenhagen', 'denmark'),
+    'helsinki': ('helsinki', 'finland'),
+    'vienna': ('vienna', 'austria'),
+    'warsaw': ('warsaw', 'poland'),
+    'prague': ('prague', 'czech republic'),
+    'budapest': ('budapest', 'hungary'),
+    'lisbon': ('lisbon', 'portugal'),
+    'rome': ('rome', 'italy'),
+    'milan': ('milan', 'italy'),
+    
+    # International - Asia Pacific
+    'tokyo': ('tokyo', 'japan'),
+    'singapore': ('singapore',),
+    'sydney': ('sydney', 'australia'),
+    'melbourne': ('melbourne', 'australia'),
+    'bangalore': ('bangalore', 'bengaluru', 'india'),
+    'mumbai': ('mumbai', 'bombay', 'india'),
+    'delhi': ('delhi', 'new delhi', 'india'),
+    'hyderabad': ('hyderabad', 'india'),
+    'pune': ('pune', 'india'),
+    'chennai': ('chennai', 'madras', 'india'),
+    'hong kong': ('hong kong', 'hk'),
+    'seoul': ('seoul', 'south korea', 'korea'),
+    'beijing': ('beijing', 'china'),
+    'shanghai': ('shanghai', 'china'),
+    'taipei': ('taipei', 'taiwan'),
+    'bangkok': ('bangkok', 'thailand'),
+    'manila': ('manila', 'philippines'),
+    'jakarta': ('jakarta', 'indonesia'),
+    'kuala lumpur': ('kuala lumpur', 'malaysia'),
+    
+    # Latin America
+    'mexico city': ('mexico city', 'mexico', 'mx', 'cdmx'),
+    'sao paulo': ('sao paulo', 'brazil'),
+    'buenos aires': ('buenos aires', 'argentina'),
+    'santiago': ('santiago', 'chile'),
+    'bogota': ('bogota', 'colombia'),
+    
+    # Other patterns
+    'tel aviv': ('tel aviv', 'israel'),
+    'emea': ('emea', 'europe', 'europe middle east africa'),
+    'apac': ('apac', 'asia pacific', 'asia-pacific'),
+    'latam': ('latam', 'latin america'),
+    'mena': ('mena', 'middle east north africa')
+}
+
+
+def _build_alias_index() -> Tuple[Dict[str, Tuple[str, ...]], Tuple[Tuple[str, str], ...]]:
+    """Index LOCATION_MAPPINGS by alias, keeping mapping order."""
+    alias_canonicals: Dict[str, List[str]] = {}
+    alias_pairs = []
+    for canonical, aliases in LOCATION_MAPPINGS.items():
+        for alias in aliases:
+            alias_canonicals.setdefault(alias, []).append(canonical)
+            alias_pairs.append((alias, canonical))
+    return {alias: tuple(canonicals) for alias, canonicals in alias_canonicals.items()}, tuple(alias_pairs)
+
+
+# Alias -> canonical locations it belongs to, in mapping order (some, like "ca",
+# belong to several), plus the same (alias, canonical) pairs as one flat tuple
+_ALIAS_CANONICALS, _ALIAS_PAIRS = _build_alias_index()
+
+
+@lru_cache(maxsize=4096)
+def _is_remote_location(location: str) -> bool:
+    """Cached remote check; job boards repeat the same location strings constantly."""
+    return _REMOTE_RE.search(location) is not None
+
+
+@lru_cache(maxsize=8192)
+def _normalize_location(location: str) -> Tuple[str, ...]:
+    """Bounded, cached normalization behind LocationMatcher.normalize_location."""
+    # Clean up the location string
+    cleaned = location.lower()
+    
+    # Remove common prefixes/suffixes
+    cleaned = _AFFIX_RE.sub('', cleaned)
+    
+    # Replace special characters and normalize whitespace
+    cleaned = _SPECIAL_CHARS_RE.sub('', cleaned)
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
+    
+    # Split on common separators
+    for separator in _SEPARATORS:
+        if separator in cleaned:
+            parts = [part.strip() for part in cleaned.split(separator)]
+            break
+    else:
+        parts = [cleaned]
+    
+    # Filter out empty parts and common noise words
+    return tuple(part for part in parts if part and part not in _NOISE_WORDS)
+
+
 class LocationMatcher:
     """Enhanced location matching with comprehensive alias support."""
     
     def __init__(self):
         """Initialize location mappings and aliases."""
-        self.location_mappings = {
-            # US Cities and States
-            'chicago': ['chicago', 'chi', 'illinois', 'il'],
-            'new york': ['new york', 'nyc', 'ny', 'new york city', 'manhattan'],
-            'san francisco': ['san francisco', 'sf', 'ssf', 'south san francisco'],
-            'seattle': ['seattle', 'sea', 'washington', 'wa'],
-            'atlanta': ['atlanta', 'atl', 'georgia', 'ga'],
-            'boston': ['boston', 'massachusetts', 'ma'],
-            'texas': ['texas', 'tx', 'dallas', 'austin', 'houston'],
-            'california': ['california', 'ca', 'calif'],
-            'los angeles': ['los angeles', 'la', 'los angeles county'],
-            'denver': ['denver', 'colorado', 'co'],
-            'phoenix': ['phoenix', 'arizona', 'az'],
-            'portland': ['portland', 'oregon', 'or'],
-            'miami': ['miami', 'florida', 'fl'],
-            'philadelphia': ['philadelphia', 'philly', 'pennsylvania', 'pa'],
-            'detroit': ['detroit', 'michigan', 'mi'],
-            'las vegas': ['las vegas', 'vegas', 'nevada', 'nv'],
-            'salt lake city': ['salt lake city', 'slc', 'utah', 'ut'],
-            'minneapolis': ['minneapolis', 'minnesota', 'mn'],
-            'nashville': ['nashville', 'tennessee', 'tn'],
-            'raleigh': ['raleigh', 'north carolina', 'nc'],
-            'charlotte': ['charlotte', 'north carolina', 'nc'],
-            'richmond': ['richmond', 'virginia', 'va'],
-            'pittsburgh': ['pittsburgh', 'pennsylvania', 'pa'],
-            
-            # US Regions/Remote
-            'remote': ['remote', 'us-remote', 'us remote', 'remote us', 'remote in us', 
-                      'remote in the us', 'work from home', 'wfh', 'telecommute', 
-                      'distributed', 'anywhere'],
-            'us': ['us', 'usa', 'united states', 'america', 'amer', 'national us'],
-            'canada': ['canada', 'ca', 'toronto', 'ca-remote', 'can-remote', 
-                      'ca-toronto', 'vancouver', 'montreal', 'ottawa', 'calgary'],
-            
-            # International - Europe
-            'london': ['london', 'uk', 'united kingdom', 'england', 'great britain'],
-            'dublin': ['dublin', 'ireland', 'dublin hq'],
-            'berlin': ['berlin', 'germany', 'de-berlin', 'deutschland'],
-            'paris': ['paris', 'france'],
-            'madrid': ['madrid', 'spain'],
-            'barcelona': ['barcelona', 'spain'],
-            'bucharest': ['bucharest', 'romania'],
-            'amsterdam': ['amsterdam', 'netherlands', 'holland'],
-            'zurich': ['zurich', 'switzerland'],
-            'stockholm': ['stockholm', 'sweden'],
-            'oslo': ['oslo', 'norway'],
-            'copenhagen': ['copenhagen', 'denmark'],
-            'helsinki': ['helsinki', 'finland'],
-            'vienna': ['vienna', 'austria'],
-            'warsaw': ['warsaw', 'poland'],
-            'prague': ['prague', 'czech republic'],
-            'budapest': ['budapest', 'hungary'],
-            'lisbon': ['lisbon', 'portugal'],
-            'rome': ['rome', 'italy'],
-            'milan': ['milan', 'italy'],
-            
-            # International - Asia Pacific
-            'tokyo': ['tokyo', 'japan'],
-            'singapore': ['singapore'],
-            'sydney': ['sydney', 'australia'],
-            'melbourne': ['melbourne', 'australia'],
-            'bangalore': ['bangalore', 'bengaluru', 'india'],
-            'mumbai': ['mumbai', 'bombay', 'india'],
-            'delhi': ['delhi', 'new delhi', 'india'],
-            'hyderabad': ['hyderabad', 'india'],
-            'pune': ['pune', 'india'],
-            'chennai': ['chennai', 'madras', 'india'],
-            'hong kong': ['hong kong', 'hk'],
-            'seoul': ['seoul', 'south korea', 'korea'],
-            'beijing': ['beijing', 'china'],
-            'shanghai': ['shanghai', 'china'],
-            'taipei': ['taipei', 'taiwan'],
-            'bangkok': ['bangkok', 'thailand'],
-            'manila': ['manila', 'philippines'],
-            'jakarta': ['jakarta', 'indonesia'],
-            'kuala lumpur': ['kuala lumpur', 'malaysia'],
-            
-            # Latin America
-            'mexico city': ['mexico city', 'mexico', 'mx', 'cdmx'],
-            'sao paulo': ['sao paulo', 'brazil'],
-            'buenos aires': ['buenos aires', 'argentina'],
-            'santiago': ['santiago', 'chile'],
-            'bogota': ['bogota', 'colombia'],
-            
-            # Other patterns
-            'tel aviv': ['tel aviv', 'israel'],
-            'emea': ['emea', 'europe', 'europe middle east africa'],
-            'apac': ['apac', 'asia pacific', 'asia-pacific'],
-            'latam': ['latam', 'latin america'],
-            'mena': ['mena', 'middle east north africa']
-        }
+        self.location_mappings = LOCATION_MAPPINGS
         
-        # Cache for normalized locations to improve performance
-        self._normalization_cache = {}
+        # Match results only depend on the two strings, which repeat across jobs and alerts
+        self._match_location_cached = lru_cache(maxsize=4096)(self._match_location)
     
     def normalize_location(self, location: str) -> List[str]:
         """
@@ -119,43 +194,7 @@ class LocationMatcher:
         if not location:
             return []
         
-        # Check cache first
-        if location in self._normalization_cache:
-            return self._normalization_cache[location]
-        
-        # Clean up the location string
-        cleaned = location.lower()
-        
-        # Remove common prefixes/suffixes
-        cleaned = re.sub(r'^(us-|ca-|uk-)', '', cleaned)
-        cleaned = re.sub(r'\s+(hq|headquarters)$', '', cleaned)
-        
-        # Replace special characters and normalize whitespace
-        cleaned = re.sub(r'[^\w\s,;/-]', '', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # Split on common separators
-        parts = []
-        for separator in [',', ';', ' and ', ' or ', '/']:
-            if separator in cleaned:
-                parts.extend([part.strip() for part in cleaned.split(separator)])
-                break
-        else:
-            parts = [cleaned]
-        
-        # Filter out empty parts and common noise words
-        noise_words = {'and', 'or', 'the', 'area', 'metro', 'region', 'greater'}
-        normalized_parts = []
-        
-        for part in parts:
-            part = part.strip()
-            if part and part not in noise_words:
-                normalized_parts.append(part)
-        
-        # Cache the result
-        self._normalization_cache[location] = normalized_parts
-        
-        return normalized_parts
+        return list(_normalize_location(location))
     
     def match_location(self, job_location: str, target_location: str) -> bool:
         """
@@ -171,42 +210,32 @@ class LocationMatcher:
         if not job_location or not target_location:
             return False
         
-        job_parts = self.normalize_location(job_location)
-        target_parts = self.normalize_location(target_location)
+        return self._match_location_cached(job_location, target_location)
+    
+    def _match_location(self, job_location: str, target_location: str) -> bool:
+        """Uncached implementation of match_location."""
+        job_parts = _normalize_location(job_location)
+        target_parts = _normalize_location(target_location)
         
         if not job_parts or not target_parts:
             return False
         
-        logger.debug(f"Matching job location '{job_location}' -> {job_parts} "
-                    f"against target '{target_location}' -> {target_parts}")
+        logger.debug("Matching job location '{}' -> {} against target '{}' -> {}",
+                     job_location, job_parts, target_location, target_parts)
         
         # Check direct matches first
         for job_part in job_parts:
             for target_part in target_parts:
                 if job_part == target_part:
-                    logger.debug(f"Direct match: '{job_part}' == '{target_part}'")
+                    logger.debug("Direct match: '{}' == '{}'", job_part, target_part)
                     return True
         
-        # Check against location mappings (more precise than substring matching)
-        for canonical, aliases in self.location_mappings.items():
-            job_matches = False
-            target_matches = False
-            
-            # Check if job location matches this canonical location
-            for job_part in job_parts:
-                if job_part in aliases or any(alias == job_part for alias in aliases):
-                    job_matches = True
-                    break
-            
-            # Check if target location matches this canonical location  
-            for target_part in target_parts:
-                if target_part in aliases or any(alias == target_part for alias in aliases):
-                    target_matches = True
-                    break
-            
-            if job_matches and target_matches:
-                logger.debug(f"Alias match via '{canonical}': job={job_matches}, target={target_matches}")
-                return True
+        # Check against location mappings (more precise than substring matching):
+        # parts match when their aliases resolve to a common canonical location
+        shared = self._canonical_locations(job_parts) & self._canonical_locations(target_parts)
+        if shared:
+            logger.opt(lazy=True).debug("Alias match via {}", lambda: sorted(shared))
+            return True
         
         # Fallback: limited substring matching for very similar terms
         # Only allow if the substring is substantial (>= 3 chars) and meaningful
@@ -216,12 +245,35 @@ class LocationMatcher:
                     # Allow substring matching for city names that are very similar
                     if (job_part in target_part and len(job_part) / len(target_part) > 0.6) or \
                        (target_part in job_part and len(target_part) / len(job_part) > 0.6):
-                        logger.debug(f"Careful substring match: '{job_part}' <-> '{target_part}'")
+                        logger.debug("Careful substring match: '{}' <-> '{}'", job_part, target_part)
                         return True
         
-        logger.debug(f"No match found between '{job_location}' and '{target_location}'")
+        logger.debug("No match found between '{}' and '{}'", job_location, target_location)
         return False
     
+    def _canonical_locations(self, parts: Tuple[str, ...]) -> Set[str]:
+        """Canonical locations that any of the normalized parts is an alias of."""
+        canonicals = set()
+        for part in parts:
+            canonicals.update(_ALIAS_CANONICALS.get(part, ()))
+        return canonicals
+    
+    def _find_canonical(self, part: str) -> Optional[str]:
+        """
+        Resolve a normalized part to a canonical location.
+        
+        An exact alias wins; otherwise the first alias (in mapping order) that
+        contains the part or is contained in it.
+        """
+        canonicals = _ALIAS_CANONICALS.get(part)
+        if canonicals:
+            return canonicals[0]
+        
+        for alias, canonical in _ALIAS_PAIRS:
+            if alias in part or part in alias:
+                return canonical
+        return None
+    
     def is_remote_location(self, location: str) -> bool:
         """
         Check if a location indicates remote work.
@@ -235,13 +287,7 @@ class LocationMatcher:
         if not location:
             return False
         
-        remote_indicators = [
-            'remote', 'work from home', 'wfh', 'telecommute', 'distributed',
-            'anywhere', 'virtual', 'home-based', 'home based'
-        ]
-        
-        location_lower = location.lower()
-        return any(indicator in location_lower for indicator in remote_indicators)
+        return _is_remote_location(location)
     
     def extract_unique_locations(self, locations: List[str]) -> List[str]:
         """
@@ -260,17 +306,14 @@ class LocationMatcher:
                 continue
                 
             # Try to find canonical form
-            normalized_parts = self.normalize_location(location)
+            normalized_parts = _normalize_location(location)
             found_canonical = False
             
             for part in normalized_parts:
-                for canonical, aliases in self.location_mappings.items():
-                    if any(alias in part or part in alias for alias in aliases):
-                        canonical_locations.add(canonical.title())
-                        found_canonical = True
-                        break
-                
-                if found_canonical:
+                canonical = self._find_canonical(part)
+                if canonical is not None:
+                    canonical_locations.add(canonical.title())
+                    found_canonical = True
                     break
             
             # If no canonical form found, use the original (cleaned)
@@ -293,26 +336,44 @@ class LocationMatcher:
         if not target_location or not available_locations:
             return []
         
-        suggestions = []
-        target_parts = self.normalize_location(target_location)
+        target_parts = _normalize_location(target_location)
         
+        # Job lists repeat the same locations heavily, so score each distinct one once
+        scores: Dict[str, int] = {}
         for location in available_locations:
+            if location in scores:
+                continue
+            
             # Skip exact matches
             if self.match_location(location, target_location):
+                scores[location] = 0
                 continue
             
-            location_parts = self.normalize_location(location)
-            
             # Check for partial matches
-            similarity_score = 0
-            for target_part in target_parts:
-                for location_part in location_parts:
-                    if target_part in location_part or location_part in target_part:
-                        similarity_score += 1
-            
-            if similarity_score > 0:
-                suggestions.append((location, similarity_score))
+            scores[location] = sum(
+                1
+                for target_part in target_parts
+                for location_part in _normalize_location(location)
+                if target_part in location_part or location_part in target_part
+            )
         
-        # Sort by similarity score and return top suggestions
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return [location for location, _ in suggestions[:5]]
+        # Top suggestions by similarity score; nlargest keeps input order among ties, like a stable sort
+        return heapq.nlargest(
+            5,
+            (location for location in available_locations if scores[location] > 0),
+            key=scores.__getitem__
+        )
+
+
+# Process-wide matcher so its alias tables are built once and its caches are shared
+_location_matcher: Optional[LocationMatcher] = None
+
+
+def get_location_matcher() -> LocationMatcher:
+    """
+    Get the shared LocationMatcher, creating it on first use.
+    """
+    global _location_matcher
+    if _location_matcher is None:
+        _location_matcher = LocationMatcher()
+    return _location_matcher
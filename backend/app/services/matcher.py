@@ -1,14 +1,117 @@
 """
 Service for matching jobs against user alerts.
 """
-from typing import List, Set
+from itertools import chain
+from typing import Dict, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, or_
 from loguru import logger
 
 from app.models import Job, UserAlert, Company
 from app.services.greenhouse import GreenhouseJob
-from app.services.location_matcher import LocationMatcher
+from app.services.location_matcher import get_location_matcher
+
+
+class AlertIndex:
+    """
+    Active alerts indexed in memory for matching a batch of jobs.
+    
+    Alerts are bucketed by the companies they watch, and their lowercased
+    title keywords are kept as posting lists (keyword -> alert IDs). A job's
+    title is checked once against each distinct keyword; only alerts with an
+    include hit (or no include keywords) and no exclude hit are returned as
+    candidates for the full matches_alert check.
+    """
+    
+    def __init__(self, alerts: List[UserAlert]):
+        self._all_companies: List[UserAlert] = []
+        self._by_company: Dict[str, List[UserAlert]] = {}
+        self._keyword_alerts: Dict[str, Set[int]] = {}
+        self._exclude_keyword_alerts: Dict[str, Set[int]] = {}
+        self._keywordless_alerts: Set[int] = set()
+        
+        for alert in alerts:
+            if alert.company_slugs:
+                for slug in alert.company_slug_set:
+                    self._by_company.setdefault(slug, []).append(alert)
+            else:
+                self._all_companies.append(alert)
+            
+            if alert.title_keywords:
+                for keyword in alert.title_keywords_lower:
+                    self._keyword_alerts.setdefault(keyword, set()).add(alert.id)
+            else:
+                self._keywordless_alerts.add(alert.id)
+            
+            for keyword in alert.title_exclude_keywords_lower:
+                self._exclude_keyword_alerts.setdefault(keyword, set()).add(alert.id)
+    
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        company_slugs: Optional[Set[str]] = None,
+        departments: Optional[Set[str]] = None,
+        job_types: Optional[Set[str]] = None
+    ) -> "AlertIndex":
+        """
+        Build an index of active alerts with one query.
+        
+        On Postgres, each non-empty value set restricts the query to alerts whose
+        list for that field is empty or overlaps it. Only pass departments or
+        job_types when every job in the batch has one, since matches_alert
+        skips those filters for jobs without a value.
+        
+        Args:
+            db: Database session
+            company_slugs: Companies of the jobs about to be matched
+            departments: Departments of the jobs about to be matched
+            job_types: Job types of the jobs about to be matched
+                
+        Returns:
+            AlertIndex over the loaded alerts
+        """
+        query = select(UserAlert).where(UserAlert.is_active == True)
+        
+        if db.bind.dialect.name == "postgresql":
+            prefilters = [
+                (UserAlert.company_slugs, company_slugs),
+                (UserAlert.departments, departments),
+                (UserAlert.job_types, job_types),
+            ]
+            # An empty or NULL list means "any", as in matches_alert;
+            # the overlap (&&) tests are served by the GIN indexes on those columns
+            query = query.where(*(
+                or_(func.coalesce(func.cardinality(column), 0) == 0, column.overlap(sorted(values)))
+                for column, values in prefilters if values
+            ))
+        
+        result = await db.execute(query)
+        return cls(result.scalars().all())
+    
+    def candidates(self, company_slug: str, title_lower: str) -> List[UserAlert]:
+        """
+        Alerts that may match a job, judged by company and title keywords only.
+        
+        Args:
+            company_slug: Slug of the job's company
+            title_lower: The job's title, lowercased
+            
+        Returns:
+            Alerts that still need the full matches_alert check
+        """
+        alert_ids = set(self._keywordless_alerts)
+        for keyword, ids in self._keyword_alerts.items():
+            if keyword in title_lower:
+                alert_ids |= ids
+        for keyword, ids in self._exclude_keyword_alerts.items():
+            if keyword in title_lower:
+                alert_ids -= ids
+        
+        return [
+            alert for alert in chain(self._all_companies, self._by_company.get(company_slug, ()))
+            if alert.id in alert_ids
+        ]
 
 
 class JobMatcher:
@@ -16,7 +119,7 @@ class JobMatcher:
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.location_matcher = LocationMatcher()
+        self.location_matcher = get_location_matcher()
     
     async def find_matching_alerts(self, job: Job) -> List[UserAlert]:
         """
@@ -28,68 +131,119 @@ class JobMatcher:
         Returns:
             List of UserAlert instances that match the job
         """
-        # Fetch all active alerts
-        result = await self.db.execute(
-            select(UserAlert).where(UserAlert.is_active == True)
-        )
+        query = select(UserAlert).where(UserAlert.is_active == True)
+        
+        # Looked up once per job (from the identity map when the company is already loaded)
+        company = await self.db.get(Company, job.company_id)
+        
+        result = await self.db.execute(query)
         alerts = result.scalars().all()
         
         matching_alerts = []
         
+        # Lowercased once for every alert this job is checked against
+        title_lower = job.title.lower()
+        
         for alert in alerts:
-            if await self._job_matches_alert(job, alert):
+            if self.matches_alert(job, alert, company.slug, title_lower):
                 matching_alerts.append(alert)
         
-        logger.info(f"Job '{job.title}' at {job.company.name} matches {len(matching_alerts)} alerts")
+        logger.info(f"Job '{job.title}' at {company.name} matches {len(matching_alerts)} alerts")
         return matching_alerts
     
-    async def _job_matches_alert(self, job: Job, alert: UserAlert) -> bool:
+    async def find_matching_alerts_batch(self, jobs: List[Job]) -> Dict[int, List[UserAlert]]:
+        """
+        Find the matching alerts for several jobs with a single alert query.
+        
+        Args:
+            jobs: Job instances to match
+            
+        Returns:
+            Matching UserAlert instances by job ID
+        """
+        companies = {}
+        for job in jobs:
+            if job.company_id not in companies:
+                companies[job.company_id] = await self.db.get(Company, job.company_id)
+        
+        # Department and job type filters only narrow the query if no job lacks a value
+        index = await AlertIndex.load(
+            self.db,
+            company_slugs={company.slug for company in companies.values()},
+            departments={job.department for job in jobs} if all(job.department for job in jobs) else None,
+            job_types={job.job_type for job in jobs} if all(job.job_type for job in jobs) else None
+        )
+        
+        matches = {}
+        for job in jobs:
+            company = companies[job.company_id]
+            title_lower = job.title.lower()
+            matches[job.id] = [
+                alert for alert in index.candidates(company.slug, title_lower)
+                if self.matches_alert(job, alert, company.slug, title_lower)
+            ]
+        
+        logger.info(f"Matched {len(jobs)} jobs against active alerts: "
+                    f"{sum(len(alerts) for alerts in matches.values())} matches")
+        return matches
+    
+    def matches_alert(
+        self,
+        job: Job,
+        alert: UserAlert,
+        company_slug: Optional[str],
+        title_lower: Optional[str] = None
+    ) -> bool:
         """
-        Check if a job matches an alert's criteria.
+        Check if a job matches an alert's criteria without any database access.
         
         Args:
             job: Job to check
             alert: Alert with criteria to match against
+            company_slug: Slug of the job's company (only needed when the alert filters by company)
+            title_lower: The job's title, already lowercased (computed if omitted)
             
         Returns:
             True if job matches alert criteria, False otherwise
         """
         # Check company filter - if alert has no companies specified, include all
         if alert.company_slugs:
-            # Load company relationship if we need to check it
-            company_result = await self.db.execute(
-                select(Company).where(Company.id == job.company_id)
-            )
-            company = company_result.scalar_one_or_none()
-            if not company or company.slug not in alert.company_slugs:
-                logger.debug(f"Job '{job.title}' rejected: company filter mismatch")
+            if not company_slug or company_slug not in alert.company_slug_set:
+                logger.debug("Job '{}' rejected: company filter mismatch", job.title)
                 return False
         
+        if title_lower is None and (alert.title_keywords or alert.title_exclude_keywords):
+            title_lower = job.title.lower()
+        
         # Check title keywords (must include at least one)
         if alert.title_keywords:
-            title_lower = job.title.lower()
-            matched_keywords = [kw for kw in alert.title_keywords if kw.lower() in title_lower]
-            if not matched_keywords:
-                logger.debug(f"Job '{job.title}' rejected: no matching keywords from {alert.title_keywords}")
+            if not any(kw in title_lower for kw in alert.title_keywords_lower):
+                logger.debug("Job '{}' rejected: no matching keywords from {}", job.title, alert.title_keywords)
                 return False
             else:
-                logger.debug(f"Job '{job.title}' matched keywords: {matched_keywords}")
+                logger.opt(lazy=True).debug(
+                    "Job '{}' matched keywords: {}",
+                    lambda: job.title,
+                    lambda: [kw for kw in alert.title_keywords_lower if kw in title_lower]
+                )
         
         # Check title exclude keywords (must not include any)
         if alert.title_exclude_keywords:
-            title_lower = job.title.lower()
-            excluded_keywords = [kw for kw in alert.title_exclude_keywords if kw.lower() in title_lower]
-            if excluded_keywords:
-                logger.debug(f"Job '{job.title}' rejected: contains excluded keywords {excluded_keywords}")
+            if any(kw in title_lower for kw in alert.title_exclude_keywords_lower):
+                logger.opt(lazy=True).debug(
+                    "Job '{}' rejected: contains excluded keywords {}",
+                    lambda: job.title,
+                    lambda: [kw for kw in alert.title_exclude_keywords_lower if kw in title_lower]
+                )
                 return False
         
         # Check department filter
         if alert.departments and job.department:
-            if job.department not in alert.departments:
-                logger.debug(f"Job '{job.title}' rejected: department '{job.department}' not in {alert.departments}")
+            if job.department not in alert.department_set:
+                logger.debug("Job '{}' rejected: department '{}' not in {}", job.title, job.department, alert.departments)
                 return False
             else:
-                logger.debug(f"Job '{job.title}' matched department: {job.department}")
+                logger.debug("Job '{}' matched department: {}", job.title, job.department)
         
         # Enhanced location matching
         if alert.locations and job.location:
@@ -97,35 +251,35 @@ class JobMatcher:
             
             for alert_location in alert.locations:
                 if self.location_matcher.match_location(job.location, alert_location):
-                    logger.debug(f"Job '{job.title}' location '{job.location}' matches alert location '{alert_location}'")
+                    logger.debug("Job '{}' location '{}' matches alert location '{}'", job.title, job.location, alert_location)
                     location_matches = True
                     break
             
             # Special handling for remote preference
             if not location_matches and alert.include_remote:
                 if self.location_matcher.is_remote_location(job.location):
-                    logger.debug(f"Job '{job.title}' matched via remote inclusion: '{job.location}'")
+                    logger.debug("Job '{}' matched via remote inclusion: '{}'", job.title, job.location)
                     location_matches = True
             
             if not location_matches:
-                logger.debug(f"Job '{job.title}' rejected: location '{job.location}' doesn't match any of {alert.locations}")
+                logger.debug("Job '{}' rejected: location '{}' doesn't match any of {}", job.title, job.location, alert.locations)
                 return False
         
         # Check job type filter
         if alert.job_types and job.job_type:
-            if job.job_type not in alert.job_types:
-                logger.debug(f"Job '{job.title}' rejected: job type '{job.job_type}' not in {alert.job_types}")
+            if job.job_type not in alert.job_type_set:
+                logger.debug("Job '{}' rejected: job type '{}' not in {}", job.title, job.job_type, alert.job_types)
                 return False
             else:
-                logger.debug(f"Job '{job.title}' matched job type: {job.job_type}")
+                logger.debug("Job '{}' matched job type: {}", job.title, job.job_type)
         
         # Check remote preference (exclude remote jobs if not wanted)
         if not alert.include_remote and job.location:
             if self.location_matcher.is_remote_location(job.location):
-                logger.debug(f"Job '{job.title}' rejected: remote job but remote not included")
+                logger.debug("Job '{}' rejected: remote job but remote not included", job.title)
                 return False
         
-        logger.debug(f"Job '{job.title}' ACCEPTED by alert '{alert.name}'")
+        logger.debug("Job '{}' ACCEPTED by alert '{}'", job.title, alert.name)
         return True
     
     def get_unique_values_from_jobs(self, jobs: List[Job]) -> dict:
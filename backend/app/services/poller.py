@@ -2,17 +2,37 @@
 Main job polling orchestrator service.
 """
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import random
+from datetime import timedelta
+from typing import List, Dict, Optional, Set, Tuple
+import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from loguru import logger
 
+from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.models import Company, Job, UserAlert, Notification, PollLog
+from app.models.base import utcnow
 from app.services.greenhouse import GreenhouseClient, GreenhouseJob
 from app.services.matcher import JobMatcher
-from app.services.discord import DiscordNotifier
+from app.services.discord import DiscordNotifier, NotifierBatcher
+
+
+# Caps the backoff exponent so the interval math can't overflow
+MAX_BACKOFF_EXPONENT = 16
+
+# Jobs per INSERT ... ON CONFLICT statement (keeps bind params under asyncpg's 32767 limit)
+JOB_UPSERT_BATCH_SIZE = 500
+
+# (alert, job, future resolving to whether the notification was sent)
+PendingNotification = Tuple[UserAlert, Job, asyncio.Future]
+
+# Columns refreshed from Greenhouse when a job's content hash changes
+JOB_CONTENT_COLUMNS = (
+    "title", "department", "location", "job_type", "external_url", "content_hash", "raw_data"
+)
 
 
 class JobPollingService:
@@ -21,6 +41,10 @@ class JobPollingService:
     def __init__(self):
         self.greenhouse_client = GreenhouseClient()
         self.discord_notifier = DiscordNotifier()
+        # Coalesces a poll's new/updated jobs into one message per alert
+        self.notification_batcher = NotifierBatcher(self.discord_notifier)
+        # Company slug -> GreenhouseJob.content_key()s committed by its last successful poll
+        self._seen_job_keys: Dict[str, Set[int]] = {}
     
     async def poll_all_companies(self) -> Dict[str, any]:
         """
@@ -38,7 +62,7 @@ class JobPollingService:
             "updated_jobs": 0,
             "notifications_sent": 0,
             "notifications_failed": 0,
-            "started_at": datetime.utcnow(),
+            "started_at": utcnow(),
             "completed_at": None
         }
         
@@ -50,9 +74,20 @@ class JobPollingService:
                 
                 logger.info(f"Starting poll cycle for {len(companies)} companies")
                 
+                # Fetch every company's board concurrently up front; DB work below stays sequential
+                jobs_by_slug, fetch_errors, fetch_durations = await self.greenhouse_client.fetch_jobs_many(
+                    [company.slug for company in companies]
+                )
+                
                 # Poll each company
                 for company in companies:
-                    company_stats = await self._poll_company(db, company)
+                    company_stats = await self._poll_company(
+                        db,
+                        company,
+                        greenhouse_jobs=jobs_by_slug.get(company.slug),
+                        fetch_error=fetch_errors.get(company.slug),
+                        fetch_seconds=fetch_durations.get(company.slug, 0.0)
+                    )
                     
                     if company_stats["success"]:
                         stats["companies_successful"] += 1
@@ -65,7 +100,7 @@ class JobPollingService:
                     stats["notifications_sent"] += company_stats["notifications_sent"]
                     stats["notifications_failed"] += company_stats["notifications_failed"]
                 
-                stats["completed_at"] = datetime.utcnow()
+                stats["completed_at"] = utcnow()
                 duration = (stats["completed_at"] - stats["started_at"]).total_seconds()
                 
                 logger.info(f"Poll cycle completed in {duration:.2f}s: "
@@ -76,7 +111,7 @@ class JobPollingService:
                 
             except Exception as e:
                 logger.error(f"Error during poll cycle: {e}")
-                stats["completed_at"] = datetime.utcnow()
+                stats["completed_at"] = utcnow()
                 raise
     
     async def _get_companies_to_poll(self, db: AsyncSession) -> List[Company]:
@@ -89,30 +124,39 @@ class JobPollingService:
         Returns:
             List of Company instances ready to be polled
         """
-        now = datetime.utcnow()
+        now = utcnow()
         
         # Select companies that:
         # 1. Are active
-        # 2. Haven't been polled recently (based on their poll interval)
+        # 2. Are due according to their backoff schedule
         # 3. Are Greenhouse companies (for MVP)
         result = await db.execute(
             select(Company).where(
                 Company.is_active == True,
                 Company.ats_type == "greenhouse",
-                (Company.last_polled_at.is_(None) | 
-                 (Company.last_polled_at < now - timedelta(minutes=15)))  # Use fixed interval for now
+                (Company.next_poll_at.is_(None) | (Company.next_poll_at <= now))
             )
         )
         
         return list(result.scalars().all())
     
-    async def _poll_company(self, db: AsyncSession, company: Company) -> Dict[str, any]:
+    async def _poll_company(
+        self,
+        db: AsyncSession,
+        company: Company,
+        greenhouse_jobs: Optional[List[GreenhouseJob]] = None,
+        fetch_error: Optional[Exception] = None,
+        fetch_seconds: float = 0.0
+    ) -> Dict[str, any]:
         """
         Poll a single company for jobs and process results.
         
         Args:
             db: Database session
             company: Company to poll
+            greenhouse_jobs: Jobs already fetched for the company (fetched here if omitted)
+            fetch_error: Error from an earlier fetch attempt, recorded as a failed poll
+            fetch_seconds: How long that earlier fetch took, counted in the poll log's timing
             
         Returns:
             Statistics about the polling operation
@@ -126,44 +170,64 @@ class JobPollingService:
             "notifications_failed": 0
         }
         
+        # Backdated by any up-front fetch so started_at and response_time_ms
+        # still cover the Greenhouse request
+        start_time = utcnow() - timedelta(seconds=fetch_seconds)
+        
         # Create poll log entry
         poll_log = PollLog(
             company_id=company.id,
-            status="running"
+            status="running",
+            started_at=start_time
         )
         db.add(poll_log)
         await db.commit()
         
-        start_time = datetime.utcnow()
-        
         try:
             logger.info(f"Polling {company.name} ({company.slug})")
             
+            if fetch_error is not None:
+                raise fetch_error
+            
             # Fetch jobs from Greenhouse
-            greenhouse_jobs = await self.greenhouse_client.fetch_jobs(company.slug)
+            if greenhouse_jobs is None:
+                greenhouse_jobs = await self.greenhouse_client.fetch_jobs(company.slug)
             stats["jobs_found"] = len(greenhouse_jobs)
             
-            # Process each job
-            for gh_job in greenhouse_jobs:
-                job_result = await self._process_job(db, company, gh_job)
-                
-                if job_result["is_new"]:
-                    stats["new_jobs"] += 1
-                elif job_result["is_updated"]:
-                    stats["updated_jobs"] += 1
-                
-                stats["notifications_sent"] += job_result["notifications_sent"]
-                stats["notifications_failed"] += job_result["notifications_failed"]
+            # Notifications queued while processing jobs, sent in per-alert batches
+            pending_notifications: List[PendingNotification] = []
             
-            # Update company last polled time
+            seen_keys = self._seen_job_keys.get(company.slug, set())
+            job_keys = {gh_job.content_key() for gh_job in greenhouse_jobs}
+            
+            if db.bind.dialect.name == "postgresql":
+                # One upsert per batch instead of a lookup and write per job
+                stats.update(await self._upsert_jobs(db, company, greenhouse_jobs, pending_notifications, seen_keys))
+            else:
+                # Process each job
+                for gh_job in greenhouse_jobs:
+                    job_result = await self._process_job(db, company, gh_job, pending_notifications)
+                    
+                    if job_result["is_new"]:
+                        stats["new_jobs"] += 1
+                    elif job_result["is_updated"]:
+                        stats["updated_jobs"] += 1
+            
+            notification_stats = await self._record_notifications(db, pending_notifications)
+            stats["notifications_sent"] = notification_stats["sent"]
+            stats["notifications_failed"] = notification_stats["failed"]
+            
+            # Update company last polled time and back off if nothing changed
+            has_changes = bool(stats["new_jobs"] or stats["updated_jobs"])
+            next_poll = self._schedule_next_poll(company, has_changes, is_dead=not greenhouse_jobs)
             await db.execute(
                 update(Company)
                 .where(Company.id == company.id)
-                .values(last_polled_at=datetime.utcnow())
+                .values(last_polled_at=utcnow(), **next_poll)
             )
             
             # Update poll log
-            end_time = datetime.utcnow()
+            end_time = utcnow()
             response_time_ms = int((end_time - start_time).total_seconds() * 1000)
             
             poll_log.completed_at = end_time
@@ -175,38 +239,198 @@ class JobPollingService:
             
             await db.commit()
             stats["success"] = True
+            self._seen_job_keys[company.slug] = job_keys
             
             logger.info(f"Successfully polled {company.name}: "
                        f"{stats['jobs_found']} jobs, {stats['new_jobs']} new, {stats['updated_jobs']} updated")
             
         except Exception as e:
             # Update poll log with error
-            poll_log.completed_at = datetime.utcnow()
+            poll_log.completed_at = utcnow()
             poll_log.status = "error"
             poll_log.error_message = str(e)
+            is_dead = isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404
+            await db.execute(
+                update(Company)
+                .where(Company.id == company.id)
+                .values(**self._schedule_next_poll(company, has_changes=False, is_dead=is_dead))
+            )
             await db.commit()
             
             logger.error(f"Error polling {company.name}: {e}")
         
         return stats
     
-    async def _process_job(self, db: AsyncSession, company: Company, gh_job: GreenhouseJob) -> Dict[str, any]:
+    def _schedule_next_poll(self, company: Company, has_changes: bool, is_dead: bool = False) -> Dict[str, any]:
+        """
+        Compute a company's backoff state after a poll.
+        
+        Polls that find new or updated jobs reset the interval to the company's
+        base interval; empty or failed polls grow it geometrically up to
+        max_poll_interval_minutes, or max_dead_poll_interval_minutes for boards
+        that are empty or return 404. Jitter keeps companies from re-aligning.
+        
+        Args:
+            company: Company that was just polled
+            has_changes: Whether the poll found new or updated jobs
+            is_dead: Whether the board had no jobs or no longer exists
+            
+        Returns:
+            Column values for the company's next_poll_at and consecutive_empty_polls
+        """
+        empty_polls = 0 if has_changes else (company.consecutive_empty_polls or 0) + 1
+        
+        exponent = min(empty_polls, MAX_BACKOFF_EXPONENT)
+        max_interval = settings.max_dead_poll_interval_minutes if is_dead else settings.max_poll_interval_minutes
+        interval_minutes = min(
+            max_interval,
+            company.poll_interval_minutes * settings.poll_interval_factor ** exponent
+        )
+        delay = timedelta(minutes=interval_minutes, seconds=random.uniform(0, settings.poll_jitter_seconds))
+        
+        return {
+            "next_poll_at": utcnow() + delay,
+            "consecutive_empty_polls": empty_polls,
+        }
+    
+    def _job_values(self, company: Company, gh_job: GreenhouseJob) -> Dict[str, any]:
+        """
+        Build the Job column values for a Greenhouse job.
+        
+        Args:
+            company: Company the job belongs to
+            gh_job: Greenhouse job data
+            
+        Returns:
+            Column values keyed by Job attribute name
+        """
+        return {
+            "company_id": company.id,
+            "external_id": gh_job.id,
+            "title": gh_job.title,
+            "department": gh_job.department,
+            "location": gh_job.location,
+            "job_type": gh_job.job_type,
+            "external_url": gh_job.absolute_url,
+            "content_hash": gh_job.content_hash(),
+            "raw_data": gh_job.raw_data,
+        }
+    
+    async def _upsert_jobs(
+        self,
+        db: AsyncSession,
+        company: Company,
+        greenhouse_jobs: List[GreenhouseJob],
+        pending_notifications: List[PendingNotification],
+        seen_keys: Set[int]
+    ) -> Dict[str, int]:
+        """
+        Insert or update a company's jobs in bulk (Postgres only) and queue notifications on changes.
+        
+        Every job's last_seen_at is refreshed by a plain UPDATE. Jobs whose
+        content key was committed by the previous poll are known unchanged and
+        skip the upsert; for the rest, rows whose content hash is unchanged are
+        left alone by the upsert. RETURNING ``xmax = 0`` tells inserted rows
+        apart from updated ones.
+        
+        Args:
+            db: Database session
+            company: Company the jobs belong to
+            greenhouse_jobs: Jobs fetched from Greenhouse
+            pending_notifications: List that queued notifications are appended to
+            seen_keys: content_key()s of the jobs as of the company's last successful poll
+            
+        Returns:
+            Counts of new and updated jobs
+        """
+        stats = {"new_jobs": 0, "updated_jobs": 0}
+        
+        # One timestamp for the whole batch instead of a now() per row
+        now = utcnow()
+        
+        # Every listed job is still live, changed or not
+        external_ids = list(dict.fromkeys(gh_job.id for gh_job in greenhouse_jobs))
+        for start in range(0, len(external_ids), JOB_UPSERT_BATCH_SIZE):
+            await db.execute(
+                update(Job)
+                .where(
+                    Job.company_id == company.id,
+                    Job.external_id.in_(external_ids[start:start + JOB_UPSERT_BATCH_SIZE])
+                )
+                .values(last_seen_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        
+        # Keyed by external ID: ON CONFLICT can't touch the same row twice in one statement
+        rows = {
+            gh_job.id: {**self._job_values(company, gh_job), "first_seen_at": now, "last_seen_at": now}
+            for gh_job in greenhouse_jobs
+            if gh_job.content_key() not in seen_keys
+        }
+        values = list(rows.values())
+        
+        changed: Dict[int, bool] = {}  # job id -> inserted
+        for start in range(0, len(values), JOB_UPSERT_BATCH_SIZE):
+            stmt = pg_insert(Job).values(values[start:start + JOB_UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.company_id, Job.external_id],
+                set_={
+                    **{column: stmt.excluded[column] for column in JOB_CONTENT_COLUMNS},
+                    "last_seen_at": stmt.excluded.last_seen_at,
+                    "is_active": True,
+                },
+                where=Job.content_hash != stmt.excluded.content_hash,
+            ).returning(Job.id, literal_column("xmax = 0").label("inserted"))
+            
+            result = await db.execute(stmt)
+            changed.update(result.tuples().all())
+        
+        if not changed:
+            return stats
+        
+        # Load the new/changed jobs for matching, overwriting any stale copies in the session
+        jobs_result = await db.execute(
+            select(Job)
+            .where(Job.id.in_(list(changed)))
+            .execution_options(populate_existing=True)
+        )
+        jobs = jobs_result.scalars().all()
+        
+        # Match the whole batch against one in-memory index of the active alerts
+        matches = await JobMatcher(db).find_matching_alerts_batch(jobs)
+        
+        for job in jobs:
+            is_new = changed[job.id]
+            stats["new_jobs" if is_new else "updated_jobs"] += 1
+            
+            pending_notifications.extend(
+                await self._send_job_notifications(db, job, is_new=is_new, matching_alerts=matches[job.id])
+            )
+        
+        return stats
+    
+    async def _process_job(
+        self,
+        db: AsyncSession,
+        company: Company,
+        gh_job: GreenhouseJob,
+        pending_notifications: List[PendingNotification]
+    ) -> Dict[str, any]:
         """
-        Process a single job: create/update in database and send notifications.
+        Process a single job: create/update in database and queue notifications.
         
         Args:
             db: Database session
             company: Company the job belongs to
             gh_job: Greenhouse job data
+            pending_notifications: List that queued notifications are appended to
             
         Returns:
             Processing statistics
         """
         result = {
             "is_new": False,
-            "is_updated": False,
-            "notifications_sent": 0,
-            "notifications_failed": 0
+            "is_updated": False
         }
         
         # Check if job already exists
@@ -218,29 +442,18 @@ class JobPollingService:
         )
         existing_job = existing_job_result.scalar_one_or_none()
         
-        content_hash = gh_job.content_hash()
+        values = self._job_values(company, gh_job)
+        content_hash = values["content_hash"]
         
         if existing_job is None:
             # New job - create it
-            job = Job(
-                company_id=company.id,
-                external_id=gh_job.id,
-                title=gh_job.title,
-                department=gh_job.department,
-                location=gh_job.location,
-                job_type=gh_job.job_type,
-                external_url=gh_job.absolute_url,
-                content_hash=content_hash,
-                raw_data=gh_job.raw_data
-            )
+            job = Job(**values)
             db.add(job)
             await db.flush()  # Get the job ID
             result["is_new"] = True
             
-            # Send notifications for new job
-            notification_stats = await self._send_job_notifications(db, job, is_new=True)
-            result["notifications_sent"] = notification_stats["sent"]
-            result["notifications_failed"] = notification_stats["failed"]
+            # Queue notifications for new job
+            pending_notifications.extend(await self._send_job_notifications(db, job, is_new=True))
             
         elif existing_job.content_hash != content_hash:
             # Job was updated - update it
@@ -251,74 +464,104 @@ class JobPollingService:
             existing_job.external_url = gh_job.absolute_url
             existing_job.content_hash = content_hash
             existing_job.raw_data = gh_job.raw_data
-            existing_job.last_seen_at = datetime.utcnow()
+            existing_job.last_seen_at = utcnow()
             result["is_updated"] = True
             
-            # Send notifications for updated job
-            notification_stats = await self._send_job_notifications(db, existing_job, is_new=False)
-            result["notifications_sent"] = notification_stats["sent"]
-            result["notifications_failed"] = notification_stats["failed"]
+            # Queue notifications for updated job
+            pending_notifications.extend(await self._send_job_notifications(db, existing_job, is_new=False))
             
         else:
             # Job unchanged - just update last_seen_at
-            existing_job.last_seen_at = datetime.utcnow()
+            existing_job.last_seen_at = utcnow()
         
         return result
     
-    async def _send_job_notifications(self, db: AsyncSession, job: Job, is_new: bool) -> Dict[str, int]:
+    async def _send_job_notifications(
+        self,
+        db: AsyncSession,
+        job: Job,
+        is_new: bool,
+        matching_alerts: Optional[List[UserAlert]] = None
+    ) -> List[PendingNotification]:
         """
-        Send notifications for a job to all matching alerts.
+        Queue notifications for a job to all matching alerts.
         
         Args:
             db: Database session
             job: Job to send notifications for
             is_new: Whether this is a new job or an update
+            matching_alerts: Alerts already matched to the job (looked up if omitted)
             
         Returns:
-            Dictionary with counts of sent and failed notifications
+            Queued notifications, to be awaited and recorded by _record_notifications
         """
-        stats = {"sent": 0, "failed": 0}
-        
         # Find matching alerts
-        matcher = JobMatcher(db)
-        matching_alerts = await matcher.find_matching_alerts(job)
-        
-        for alert in matching_alerts:
-            # Check if we've already notified this alert about this job
-            existing_notification = await db.execute(
-                select(Notification).where(
-                    Notification.alert_id == alert.id,
-                    Notification.job_id == job.id
+        if matching_alerts is None:
+            matcher = JobMatcher(db)
+            matching_alerts = await matcher.find_matching_alerts(job)
+        
+        # Only Discord-enabled alerts that haven't been notified about this job yet
+        alerts_to_notify = [alert for alert in matching_alerts if alert.discord_webhook_url]
+        if alerts_to_notify:
+            notified_result = await db.execute(
+                select(Notification.alert_id).where(
+                    Notification.job_id == job.id,
+                    Notification.alert_id.in_([alert.id for alert in alerts_to_notify])
                 )
             )
+            already_notified = set(notified_result.scalars().all())
+            alerts_to_notify = [alert for alert in alerts_to_notify if alert.id not in already_notified]
+        
+        return [
+            (alert, job, self.notification_batcher.enqueue(alert.discord_webhook_url, alert, job))
+            for alert in alerts_to_notify
+        ]
+    
+    async def _record_notifications(
+        self,
+        db: AsyncSession,
+        pending_notifications: List[PendingNotification]
+    ) -> Dict[str, int]:
+        """
+        Wait for queued notifications to be sent and record each attempt.
+        
+        Args:
+            db: Database session
+            pending_notifications: Notifications queued by _send_job_notifications
+            
+        Returns:
+            Dictionary with counts of sent and failed notifications
+        """
+        stats = {"sent": 0, "failed": 0}
+        if not pending_notifications:
+            return stats
+        
+        # Everything for this company is queued, so don't wait out the batch window
+        await self.notification_batcher.flush()
+        
+        results = await asyncio.gather(
+            *(future for _, _, future in pending_notifications),
+            return_exceptions=True
+        )
+        
+        for (alert, job, _), result in zip(pending_notifications, results):
+            success = result is True
             
-            if existing_notification.scalar_one_or_none():
-                continue  # Already notified about this job
+            # Record notification attempt
+            notification = Notification(
+                alert_id=alert.id,
+                job_id=job.id,
+                notification_type="discord",
+                status="sent" if success else "failed"
+            )
+            db.add(notification)
             
-            # Send Discord notification if configured
-            if alert.discord_webhook_url:
-                success = await self.discord_notifier.send_job_notification(
-                    webhook_url=alert.discord_webhook_url,
-                    jobs=[job],
-                    alert=alert,
-                    is_initial=False
-                )
-                
-                # Record notification attempt
-                notification = Notification(
-                    alert_id=alert.id,
-                    job_id=job.id,
-                    notification_type="discord",
-                    status="sent" if success else "failed"
-                )
-                db.add(notification)
-                
-                if success:
-                    stats["sent"] += 1
-                    # Update alert last notified time
-                    alert.last_notified_at = datetime.utcnow()
-                else:
-                    stats["failed"] += 1
+            if success:
+                stats["sent"] += 1
+                # Update alert last notified time
+                alert.last_notified_at = utcnow()
+            else:
+                stats["failed"] += 1
         
         return stats
     
@@ -344,7 +587,8 @@ class JobPollingService:
                     select(Company).where(Company.slug.in_(alert.company_slugs))
                 )
                 companies = companies_result.scalars().all()
-                company_ids = [c.id for c in companies]
+                company_slugs = {c.id: c.slug for c in companies}
+                company_ids = list(company_slugs)
                 
                 jobs_result = await db.execute(
                     select(Job).where(
@@ -357,7 +601,7 @@ class JobPollingService:
                 # Filter jobs that match alert criteria
                 matching_jobs = []
                 for job in jobs:
-                    if await matcher._job_matches_alert(job, alert):
+                    if matcher.matches_alert(job, alert, company_slugs[job.company_id]):
                         matching_jobs.append(job)
                 
                 if matching_jobs and alert.discord_webhook_url:
@@ -380,7 +624,7 @@ class JobPollingService:
                             )
                             db.add(notification)
                         
-                        alert.last_notified_at = datetime.utcnow()
+                        alert.last_notified_at = utcnow()
                         await db.commit()
                     
                     return success
@@ -401,7 +645,8 @@ class JobPollingService:
         return await self.poll_all_companies()
 
     async def close(self) -> None:
-        """Close all client connections."""
+        """Send any queued notifications, then close all client connections."""
+        await self.notification_batcher.drain()
         await self.greenhouse_client.close()
         await self.discord_notifier.close()
 
@@ -10,7 +10,7 @@ setup(
         "sqlalchemy>=2.0.23",
         "alembic>=1.12.1",
         "asyncpg>=0.29.0",
-        "httpx>=0.25.2",
+        "httpx[http2]>=0.25.2",
         "pydantic>=2.5.0",
         "pydantic-settings>=2.1.0",
         "python-multipart>=0.0.6",
@@ -18,6 +18,9 @@ setup(
         "python-dotenv>=1.0.0",
         "apscheduler>=3.10.4",
         "loguru>=0.7.2",
+        "cachetools>=5.3.0",
+        "orjson>=3.9.10",
+        "xxhash>=3.4.1",
     ],
     python_requires=">=3.11",
 )
\ No newline at end of file
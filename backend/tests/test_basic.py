@@ -3,9 +3,23 @@ Basic tests to verify the RushJob backend setup.
 """
 import pytest
 import asyncio
+import uuid
+from datetime import timedelta
 from fastapi.testclient import TestClient
+import httpx
+from sqlalchemy import delete
 from app.main import app
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Company, Job, UserAlert
+from app.models.base import utcnow
+from app.schemas.jobs import JobResponseSimple
+from app.services.discord import (
+    WEBHOOK_MAX_ATTEMPTS, WEBHOOK_RETRY_JITTER_SECONDS, DiscordNotifier, NotifierBatcher
+)
 from app.services.greenhouse import GreenhouseClient, GreenhouseJob
+from app.services.matcher import AlertIndex, JobMatcher
+from app.services.poller import JobPollingService
 
 
 client = TestClient(app)
@@ -49,7 +63,7 @@ def test_greenhouse_job_parsing():
     assert job.location == "San Francisco, CA"
     assert job.department == "Engineering"
     assert job.job_type == "Full-time"
-    assert len(job.content_hash()) == 64  # SHA256 hash length
+    assert len(job.content_hash()) == 8  # xxh3-64 digest length
 
 
 @pytest.mark.asyncio
@@ -68,6 +82,314 @@ def test_api_companies_endpoint():
     assert isinstance(response.json(), list)
 
 
+def test_api_jobs_endpoint():
+    """Test jobs endpoint returns JobResponseSimple-shaped items."""
+    async def add_job():
+        async with AsyncSessionLocal() as db:
+            company = Company(name="Test Co", slug=f"test-co-{uuid.uuid4().hex[:8]}",
+                              ats_type="greenhouse", api_endpoint="https://example.com")
+            db.add(company)
+            await db.flush()
+            db.add(Job(company_id=company.id, external_id="1", title="Software Engineer",
+                       external_url="https://example.com/jobs/1", content_hash=b"\0" * 8, raw_data={}))
+            await db.commit()
+            return company.id
+    
+    async def remove_jobs(company_id):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Job).where(Job.company_id == company_id))
+            await db.execute(delete(Company).where(Company.id == company_id))
+            await db.commit()
+    
+    # Entering the client runs the lifespan, which creates the tables
+    with TestClient(app) as lifespan_client:
+        company_id = lifespan_client.portal.call(add_job)
+        try:
+            response = lifespan_client.get("/api/v1/jobs", params={"limit": 5})
+            assert response.status_code == 200
+            jobs = response.json()
+            assert isinstance(jobs, list) and jobs
+            for job in jobs:
+                assert set(job) == set(JobResponseSimple.model_fields)
+            
+            assert lifespan_client.get("/api/v1/jobs", params={"limit": 10000}).status_code == 422
+        finally:
+            lifespan_client.portal.call(remove_jobs, company_id)
+
+
+def test_alert_index_candidates_match_full_check():
+    """Test that AlertIndex never drops an alert that matches_alert accepts."""
+    def make_alert(alert_id, **criteria):
+        fields = dict(company_slugs=[], title_keywords=[], title_exclude_keywords=[],
+                      departments=[], locations=[], job_types=[], include_remote=True)
+        fields.update(criteria)
+        return UserAlert(id=alert_id, name=f"alert {alert_id}", **fields)
+    
+    alerts = [
+        make_alert(1),
+        make_alert(2, title_keywords=["Engineer"]),
+        make_alert(3, title_keywords=["engineer"], title_exclude_keywords=["Senior"]),
+        make_alert(4, company_slugs=["stripe"], title_keywords=["designer"]),
+        make_alert(5, company_slugs=["stripe", "airbnb"]),
+        make_alert(6, title_exclude_keywords=["intern"]),
+        make_alert(7, company_slugs=["airbnb"], title_keywords=["engineer", "manager"]),
+    ]
+    jobs = [
+        ("stripe", "Senior Software Engineer"),
+        ("stripe", "Product Designer"),
+        ("airbnb", "Engineering Manager"),
+        ("airbnb", "Design Intern"),
+        ("github", "Software Engineer"),
+        ("github", "Recruiter"),
+    ]
+    
+    index = AlertIndex(alerts)
+    matcher = JobMatcher(db=None)
+    
+    for company_slug, title in jobs:
+        job = Job(title=title, location=None, department=None, job_type=None)
+        title_lower = title.lower()
+        candidates = index.candidates(company_slug, title_lower)
+        
+        expected = {a.id for a in alerts if matcher.matches_alert(job, a, company_slug, title_lower)}
+        assert {a.id for a in candidates} == expected, (company_slug, title)
+    
+    # Company buckets and keyword posting lists in isolation
+    assert {a.id for a in index.candidates("stripe", "senior software engineer")} == {1, 2, 5, 6}
+    assert {a.id for a in index.candidates("airbnb", "design intern")} == {1, 5}
+    assert {a.id for a in index.candidates("github", "recruiter")} == {1, 6}
+
+
+@pytest.mark.asyncio
+async def test_poll_backoff_schedule():
+    """Test that empty polls back off geometrically and changes reset the interval."""
+    service = JobPollingService()
+    jitter = timedelta(seconds=settings.poll_jitter_seconds)
+    
+    def delay_bounds(minutes):
+        return timedelta(minutes=minutes), timedelta(minutes=minutes) + jitter
+    
+    try:
+        company = Company(poll_interval_minutes=15, consecutive_empty_polls=0)
+        
+        before = utcnow()
+        next_poll = service._schedule_next_poll(company, has_changes=False)
+        low, high = delay_bounds(15 * settings.poll_interval_factor)
+        assert next_poll["consecutive_empty_polls"] == 1
+        assert next_poll["next_poll_at"].tzinfo is not None
+        assert before + low <= next_poll["next_poll_at"] <= utcnow() + high
+        
+        # Long empty streaks are capped, with a longer cap for dead boards
+        company.consecutive_empty_polls = 3000
+        before = utcnow()
+        next_poll = service._schedule_next_poll(company, has_changes=False)
+        low, high = delay_bounds(settings.max_poll_interval_minutes)
+        assert next_poll["consecutive_empty_polls"] == 3001
+        assert before + low <= next_poll["next_poll_at"] <= utcnow() + high
+        
+        before = utcnow()
+        next_poll = service._schedule_next_poll(company, has_changes=False, is_dead=True)
+        low, high = delay_bounds(settings.max_dead_poll_interval_minutes)
+        assert before + low <= next_poll["next_poll_at"] <= utcnow() + high
+        
+        # Any change resets to the company's base interval
+        before = utcnow()
+        next_poll = service._schedule_next_poll(company, has_changes=True)
+        low, high = delay_bounds(15)
+        assert next_poll["consecutive_empty_polls"] == 0
+        assert before + low <= next_poll["next_poll_at"] <= utcnow() + high
+    finally:
+        await service.close()
+
+
+def _mock_notifier(handler):
+    """DiscordNotifier whose webhook POSTs are answered by `handler`."""
+    return DiscordNotifier(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _notification_job(job_id):
+    """Transient job with the fields a notification embed reads."""
+    return Job(id=job_id, title=f"Engineer {job_id}", department="Engineering", location="Remote",
+               job_type="Full-time", external_url=f"https://example.com/jobs/{job_id}",
+               company=Company(name="Test Co", slug="test-co"))
+
+
+def _notification_alert(alert_id=1):
+    """Transient alert with the fields a notification embed reads."""
+    return UserAlert(id=alert_id, name="Test alert", company_slugs=[], title_keywords=[],
+                     title_exclude_keywords=[], departments=[], locations=[], job_types=[],
+                     include_remote=True)
+
+
+@pytest.mark.asyncio
+async def test_notifier_batcher_flush_sends_one_message():
+    """Test that a flushed batch goes out as a single webhook POST."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+    
+    notifier = _mock_notifier(handler)
+    batcher = NotifierBatcher(notifier)
+    alert = _notification_alert()
+    try:
+        futures = [batcher.enqueue("https://discord.test/hook", alert, _notification_job(i)) for i in range(12)]
+        await batcher.flush()
+        
+        assert len(requests) == 1
+        assert await asyncio.gather(*futures) == [True] * 12
+    finally:
+        await batcher.drain()
+        await notifier.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_notifier_batcher_sends_after_max_wait():
+    """Test that a batch is sent on its own once its oldest job has waited max_wait."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+    
+    notifier = _mock_notifier(handler)
+    batcher = NotifierBatcher(notifier, max_wait=0.05)
+    try:
+        future = batcher.enqueue("https://discord.test/hook", _notification_alert(), _notification_job(1))
+        assert not requests
+        
+        assert await asyncio.wait_for(future, timeout=2) is True
+        assert len(requests) == 1
+    finally:
+        await batcher.drain()
+        await notifier.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_notifier_batcher_failed_post_fails_whole_batch():
+    """Test that every job in a batch is reported failed when its POST fails."""
+    notifier = _mock_notifier(lambda request: httpx.Response(400))
+    batcher = NotifierBatcher(notifier)
+    alert = _notification_alert()
+    try:
+        futures = [batcher.enqueue("https://discord.test/hook", alert, _notification_job(i)) for i in range(3)]
+        await batcher.flush()
+        
+        assert await asyncio.gather(*futures) == [False] * 3
+    finally:
+        await batcher.drain()
+        await notifier.client.aclose()
+
+
+def _record_sleeps(monkeypatch):
+    """Make retry sleeps in the Discord module instant, returning the delays asked for."""
+    delays = []
+    real_sleep = asyncio.sleep
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+    
+    monkeypatch.setattr("app.services.discord.asyncio.sleep", fake_sleep)
+    return delays
+
+
+def _replay(statuses_and_headers, requests):
+    """MockTransport handler answering with the given (status, headers) pairs in order."""
+    responses = iter(statuses_and_headers)
+    
+    def handler(request):
+        requests.append(request)
+        status, headers = next(responses)
+        return httpx.Response(status, headers=headers)
+    
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_webhook_retry_honors_retry_after(monkeypatch):
+    """Test that a 429 is retried after the server's Retry-After."""
+    delays = _record_sleeps(monkeypatch)
+    requests = []
+    notifier = _mock_notifier(_replay([(429, {"Retry-After": "3"}), (204, {})], requests))
+    try:
+        response = await notifier._post_with_retry("https://discord.test/hook", {"content": "hi"})
+        
+        assert response.status_code == 204
+        assert len(requests) == 2
+        assert 3 <= delays[0] <= 3 + WEBHOOK_RETRY_JITTER_SECONDS
+    finally:
+        await notifier.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_webhook_retry_recovers_from_throttling_and_server_errors(monkeypatch):
+    """Test that a 429 then a 502 then a 204 succeeds on the third attempt."""
+    _record_sleeps(monkeypatch)
+    requests = []
+    notifier = _mock_notifier(_replay([(429, {"Retry-After": "1"}), (502, {}), (204, {})], requests))
+    try:
+        sent = await notifier._post_notification("https://discord.test/hook", {"content": "hi"}, 1, "Test alert")
+        
+        assert sent is True
+        assert len(requests) == 3
+    finally:
+        await notifier.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_webhook_retry_gives_up_after_max_attempts(monkeypatch):
+    """Test that persistent server errors stop after WEBHOOK_MAX_ATTEMPTS and report failure."""
+    _record_sleeps(monkeypatch)
+    requests = []
+    notifier = _mock_notifier(_replay([(503, {})] * (WEBHOOK_MAX_ATTEMPTS + 1), requests))
+    try:
+        sent = await notifier._post_notification("https://discord.test/hook", {"content": "hi"}, 1, "Test alert")
+        
+        assert sent is False
+        assert len(requests) == WEBHOOK_MAX_ATTEMPTS
+    finally:
+        await notifier.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_greenhouse_conditional_get():
+    """Test that a 304 reuses the cached jobs and validators are dropped when a response has none."""
+    board = b'{"jobs": [{"id": 1, "title": "Engineer", "location": {"name": "Remote"}, "absolute_url": "u"}]}'
+    responses = iter([
+        httpx.Response(200, content=board, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        httpx.Response(304),
+        httpx.Response(200, content=board),
+        httpx.Response(200, content=board),
+    ])
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return next(responses)
+    
+    gh_client = GreenhouseClient()
+    await gh_client.client.aclose()
+    gh_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        jobs = await gh_client.fetch_jobs("test-co")
+        assert [job.id for job in jobs] == ["1"]
+        assert "If-None-Match" not in requests[0].headers
+        
+        assert await gh_client.fetch_jobs("test-co") is jobs
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert requests[1].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        
+        # A response without validators clears them, so the next request is unconditional
+        await gh_client.fetch_jobs("test-co")
+        await gh_client.fetch_jobs("test-co")
+        assert "If-None-Match" not in requests[3].headers
+        assert "If-Modified-Since" not in requests[3].headers
+    finally:
+        await gh_client.close()
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
\ No newline at end of file